@@ -1,5 +1,6 @@
 """Noonlight integration for Home Assistant."""
 
+import asyncio
 import logging
 from datetime import timedelta
 
@@ -7,22 +8,23 @@ import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ID, CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.const import (
+    CONF_ID,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    CONF_WEBHOOK_ID,
+)
 from homeassistant.core import DOMAIN as HOMEASSISTANT_DOMAIN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import (
-    async_track_point_in_utc_time,
-    async_track_time_interval,
-)
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.issue_registry import IssueSeverity, async_create_issue
 from homeassistant.helpers.typing import ConfigType
 
-import aiohttp
 import json
 
 from .const import (
@@ -35,18 +37,48 @@ from .const import (
     CONF_STATE,
     CONF_ZIP,
     CONF_COUNTRY,
+    CONF_EVENT_ENTITIES,
+    CONF_LOCATION_ENTITY,
+    CONF_MAX_ALARM_LIFETIME,
+    CONF_TRACING,
+    CONF_TRIGGER_RULES,
+    ALARM_STATUS_FALLBACK_INTERVAL,
     CONST_ALARM_STATUS_ACTIVE,
-    CONST_ALARM_STATUS_CANCELED,
-    CONST_NOONLIGHT_HA_SERVICE_CREATE_ALARM,
+    CONST_ALARM_TERMINAL_STATUSES,
+    CONST_NOONLIGHT_SERVICE_TYPES,
+    ALARM_RESULT_CREATED,
+    ALARM_RESULT_ESCALATED,
+    ALARM_RESULT_FAILED,
+    ALARM_RESULT_JOINED,
+    ALARM_RESULT_UNCHANGED,
+    DEFAULT_MAX_ALARM_LIFETIME,
+    OUTBOX_RETRY_INTERVAL,
+    DATA_HUB,
+    DEFAULT_NAME,
     DOMAIN,
-    EVENT_NOONLIGHT_ALARM_CANCELED,
-    EVENT_NOONLIGHT_ALARM_CREATED,
     NOTIFICATION_ALARM_CREATE_FAILURE,
     PLATFORMS,
 )
+from .api import NoonlightApiError, NoonlightClient
+from .coordinator import NoonlightCoordinator
+from .countdown import AlarmCountdown
+from .credentials import TokenValidator
+from .delivery import AlarmDelivery, AlarmDeliveryError
+from .endpoints import parse_endpoints
+from .events import AlarmEventForwarder
+from .hub import NoonlightHub
+from .location import LocationUpdater
+from .metrics import NoonlightMetrics
+from .models import NoonlightAlarm
+from .outbox import AlarmOutbox
+from .poller import AlarmPollSettings, StatusPollError
+from .ratelimit import RateLimiter
+from .registry import AlarmRegistry
+from .services import async_setup_services
+from .tracing import AlarmTracer
+from .triggers import AlarmTriggerEngine
 
 _LOGGER = logging.getLogger(__name__)
-TOKEN_CHECK_INTERVAL = timedelta(minutes=15)
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -76,6 +108,7 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up from YAML."""
+    async_setup_services(hass)
     if DOMAIN not in config:
         return True
 
@@ -110,44 +143,112 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
 
     _LOGGER.debug(f"[init async_setup_entry] entry: {entry.data}")
-    noonlight_integration = NoonlightIntegration(hass, entry.data)
+    if CONF_WEBHOOK_ID not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()},
+        )
+
+    if DATA_HUB not in hass.data:
+        hass.data[DATA_HUB] = NoonlightHub(hass)
+    noonlight_integration = NoonlightIntegration(
+        hass, entry.data, entry.options, entry.entry_id, hass.data[DATA_HUB]
+    )
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = noonlight_integration
-
-    #
-    # Modified service handler to support instruction text
-    #
-    async def handle_create_alarm_service(call):
-        """Create a Noonlight alarm from a service call."""
-        service = call.data.get("service", None)
-        instruction = call.data.get("instruction")  # new optional field
-        await noonlight_integration.create_alarm(
-            alarm_types=[service],
-            instruction=instruction,
+    await noonlight_integration.async_restore()
+
+    async def handle_webhook(hass, webhook_id, request):
+        """Handle an alarm status callback from Noonlight."""
+        try:
+            payload = await request.json()
+        except ValueError:
+            _LOGGER.warning("Received invalid JSON on the Noonlight webhook")
+            return None
+
+        _LOGGER.debug(f"[handle_webhook] payload: {payload}")
+        data = payload.get("data", payload) if isinstance(payload, dict) else None
+        if not isinstance(data, dict):
+            _LOGGER.warning("Ignoring Noonlight webhook payload that is not an object")
+            return None
+        alarm_id = data.get("alarm_id", data.get("id"))
+        status = data.get("status")
+        if not isinstance(alarm_id, str) or not isinstance(status, str):
+            return None
+        if noonlight_integration.alarms.get(alarm_id) is None:
+            _LOGGER.debug(f"Ignoring Noonlight webhook for unknown alarm {alarm_id}")
+            return None
+        # The webhook is not authenticated, so the status is only a hint to poll
+        hass.async_create_task(
+            noonlight_integration.async_confirm_status(alarm_id, status),
+            f"{DOMAIN}_confirm_status_{alarm_id}",
         )
+        return None
 
-    hass.services.async_register(
-        DOMAIN, CONST_NOONLIGHT_HA_SERVICE_CREATE_ALARM, handle_create_alarm_service
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        "Noonlight2",
+        entry.data[CONF_WEBHOOK_ID],
+        handle_webhook,
     )
-
-    # Server token validation - no periodic renewal needed
-    if not await noonlight_integration.check_api_token():
-        _LOGGER.error("Noonlight server token is missing or invalid")
+    try:
+        webhook_url = webhook.async_generate_url(hass, entry.data[CONF_WEBHOOK_ID])
+        # The URL is the only secret protecting the webhook
+        _LOGGER.debug(f"Noonlight status callback URL: {webhook_url}")
+    except Exception as e:
+        _LOGGER.warning(f"Unable to determine the Noonlight webhook URL: {e}")
+
+    if not noonlight_integration.server_token:
+        _LOGGER.error("Noonlight server token is missing")
+        webhook.async_unregister(hass, entry.data[CONF_WEBHOOK_ID])
+        hass.data[DOMAIN].pop(entry.entry_id)
+        await noonlight_integration.async_stop()
         return False
 
+    # Open the API connection and validate the token in the background so
+    # setup is not delayed
+    entry.async_create_background_task(
+        hass,
+        noonlight_integration.transport.async_start(),
+        f"{DOMAIN}_transport_warm_{entry.entry_id}",
+    )
+    noonlight_integration.token_validator.start()
+    noonlight_integration.triggers.start()
+    entry.async_create_background_task(
+        hass,
+        noonlight_integration.check_api_token(force_renew=True),
+        f"{DOMAIN}_token_check_{entry.entry_id}",
+    )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    noonlight_integration = hass.data[DOMAIN][entry.entry_id]
+    if dict(entry.options) != dict(noonlight_integration.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info(f"Unloading: {entry.data}")
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.pop(DOMAIN)
+        webhook.async_unregister(hass, entry.data[CONF_WEBHOOK_ID])
+        noonlight_integration = hass.data[DOMAIN].pop(entry.entry_id)
+        await noonlight_integration.async_stop()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored outbox of a removed config entry."""
+    await AlarmOutbox(hass, entry.entry_id).async_remove()
+
+
 class NoonlightException(HomeAssistantError):
     """General exception for Noonlight Integration."""
     pass
@@ -156,15 +257,52 @@ class NoonlightException(HomeAssistantError):
 class NoonlightIntegration:
     """Integration for interacting with Noonlight from Home Assistant."""
 
-    def __init__(self, hass, conf):
+    def __init__(self, hass, conf, options=None, entry_id=None, hub=None):
         """Initialize NoonlightIntegration."""
         self.hass = hass
         self.config = conf
-        self._alarm = None
+        self.entry_id = entry_id
+        self.hub = hub or NoonlightHub(hass)
+        self.options = options or {}
+        self.alarms = AlarmRegistry()
+        self.metrics = NoonlightMetrics(hass.loop.time)
+        self.outbox = AlarmOutbox(hass, entry_id)
+        self.event_forwarder = AlarmEventForwarder(
+            hass,
+            self.async_create_alarm_events,
+            self.options.get(CONF_EVENT_ENTITIES, []),
+        )
+        self.location_updater = LocationUpdater(
+            hass,
+            self.async_update_alarm_location,
+            self.options.get(CONF_LOCATION_ENTITY),
+        )
+        self._cancel_outbox_retry = None
+        self._create_future = None
+        self._confirming: set[str] = set()
+        self._pending_services = {}
+        self._pending_instruction = None
         self.pin = self.config.get("pin", "")
-        self._websession = async_get_clientsession(self.hass)
-        self.api_endpoint = self.config[CONF_API_ENDPOINT]
+        # Endpoints in order of preference, separated by commas
+        self.api_endpoints = parse_endpoints(self.config[CONF_API_ENDPOINT])
+        self.tracer = AlarmTracer(hass.loop.time, self.options.get(CONF_TRACING, False))
+        self.transport = self.hub.acquire_transport(
+            self.api_endpoints, self.tracer.trace_configs()
+        )
         self.server_token = self.config[CONF_SERVER_TOKEN]
+        self.webhook_id = self.config.get(CONF_WEBHOOK_ID)
+        self.poller = self.hub.poller
+        self.poll_settings = AlarmPollSettings(
+            self.update_alarm_status,
+            timedelta(
+                hours=self.options.get(
+                    CONF_MAX_ALARM_LIFETIME, DEFAULT_MAX_ALARM_LIFETIME
+                )
+            ),
+            # Safety-net polling once the webhook is known to deliver updates
+            min_interval=ALARM_STATUS_FALLBACK_INTERVAL,
+            on_expired=self._on_alarm_expired,
+        )
 
         # Add address portions, if exist
         self.addline1 = self.config.get(CONF_ADDRESS_LINE1, "")
@@ -174,6 +312,30 @@ class NoonlightIntegration:
         self.addzip = self.config.get(CONF_ZIP, "")
         self.addcountry = self.config.get(CONF_COUNTRY, "")
 
+        self.limiter = RateLimiter(hass.loop.time)
+        self.api = NoonlightClient(
+            self.transport, self.server_token, self.metrics, self.limiter
+        )
+        self._alarm_body_prefix = self._build_alarm_body_prefix()
+        self._alarm_body_prefix_no_location = self._build_alarm_body_prefix(
+            include_location=False
+        )
+        # Body built ahead of a countdown's deadline, with the arguments it
+        # was built for
+        self._prepared_body = None
+        self._delivery = AlarmDelivery(self.api, on_duplicate=self._on_duplicate_alarm)
+        self.countdown = AlarmCountdown(hass, self)
+        self.coordinator = NoonlightCoordinator(hass, self)
+        self.token_validator = TokenValidator(
+            hass, self.api, entry_id, self.config.get(CONF_NAME, DEFAULT_NAME)
+        )
+        self.triggers = AlarmTriggerEngine(
+            hass,
+            self.async_request_alarm,
+            self.countdown,
+            self.options.get(CONF_TRIGGER_RULES, []),
+        )
+
     @property
     def latitude(self):
         return self.config.get(CONF_LATITUDE, self.hass.config.latitude)
@@ -182,134 +344,475 @@ class NoonlightIntegration:
     def longitude(self):
         return self.config.get(CONF_LONGITUDE, self.hass.config.longitude)
 
+    async def async_restore(self):
+        """Resume tracking alarms and retrying intents saved before a restart."""
+        await self.outbox.async_load()
+        now = dt_util.utcnow().timestamp()
+        for alarm_id, saved in self.outbox.alarms.items():
+            _LOGGER.info(f"Resuming status tracking of alarm {alarm_id}")
+            self.alarms.add(
+                NoonlightAlarm(
+                    alarm_id,
+                    self.entry_id,
+                    CONST_ALARM_STATUS_ACTIVE,
+                    saved.get("services", {}),
+                    dt_util.utc_from_timestamp(saved["created"]),
+                )
+            )
+            self.poller.track(
+                alarm_id, self.poll_settings, age=max(now - saved["created"], 0)
+            )
+        if self._alarm is not None:
+            self.event_forwarder.start(self._alarm.id)
+            self.location_updater.start(self._alarm.id)
+        self.coordinator.async_push()
+        if self.outbox.intents:
+            self._schedule_outbox_retry(0)
+
+    async def async_stop(self):
+        """Stop background work and release the connection pool."""
+        self.token_validator.stop()
+        self.triggers.stop()
+        self.countdown.stop()
+        self.poller.untrack_all(self.poll_settings)
+        self.event_forwarder.stop()
+        self.location_updater.stop()
+        if self._cancel_outbox_retry is not None:
+            self._cancel_outbox_retry()
+            self._cancel_outbox_retry = None
+        await self.outbox.async_flush()
+        await self.hub.async_release_transport(self.transport)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device that groups the entities of this site."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.entry_id)},
+            name=self.config.get(CONF_NAME, DEFAULT_NAME),
+            manufacturer="Noonlight",
+        )
+
+    @property
+    def _alarm(self):
+        """Return the most recent active alarm, if any."""
+        return self.alarms.current
+
     @property
     def headers(self):
-        return {
-            "Authorization": f"Bearer {self.server_token}",
-            "Content-Type": "application/json",
+        return self.api.headers
+
+    def _build_alarm_body_prefix(self, include_location=True):
+        """Serialize the static part of the alarm body once.
+
+        Name, phone, PIN and location only change when the entry is
+        reconfigured, which reloads the entry and rebuilds this prefix.
+        The result is the JSON object without its closing brace so that
+        services and instructions can be appended at alarm time.
+        """
+        # Determine name (user_name preferred, fallback to Alarm System)
+        user_name = self.config.get("user_name")
+        alarm_name = user_name if user_name else "Alarm System"
+
+        # Base payload
+        alarm_body = {
+            "name": alarm_name,
+            "phone": self.config[CONF_PHONE_NUMBER],
         }
 
+        # Add PIN
+        if self.pin:
+            alarm_body["pin"] = self.pin
+
+        # Add address or coordinates
+        if not include_location:
+            return json.dumps(alarm_body, separators=(",", ":"))[:-1]
+
+        if len(self.addline1) > 0:
+            alarm_body["location"] = {
+                "address": {
+                    "line1": self.addline1,
+                    "city": self.addcity,
+                    "state": self.addstate,
+                    "zip": self.addzip,
+                    "country": self.addcountry,
+                }
+            }
+            if len(self.addline2) > 0:
+                alarm_body["location"]["address"]["line2"] = self.addline2
+        else:
+            alarm_body["location"] = {
+                "coordinates": {
+                    "lat": self.latitude,
+                    "lng": self.longitude,
+                    "accuracy": 5,
+                }
+            }
+
+        return json.dumps(alarm_body, separators=(",", ":"))[:-1]
+
+    def _build_alarm_body(self, services, instruction=None, coordinates=None):
+        """Return the encoded alarm body for the given services/instruction.
+
+        `coordinates` from the tracked location entity replace the
+        configured location.
+        """
+        if self._prepared_body is not None:
+            key, body = self._prepared_body
+            if key == (services, instruction, coordinates):
+                return body
+        prefix = self._alarm_body_prefix
+        extra = {}
+        if coordinates is not None:
+            prefix = self._alarm_body_prefix_no_location
+            extra["location"] = {"coordinates": coordinates}
+        if len(services) > 0:
+            extra["services"] = services
+        if instruction:
+            extra["instructions"] = {"entry": instruction}
+        if not extra:
+            return (prefix + "}").encode()
+        return (prefix + "," + json.dumps(extra, separators=(",", ":"))[1:]).encode()
+
+    def prepare_alarm_body(self, services, instruction=None):
+        """Build the alarm body ahead of time so sending it has no build step."""
+        coordinates = self.location_updater.current_coordinates()
+        self._prepared_body = None
+        body = self._build_alarm_body(services, instruction, coordinates)
+        self._prepared_body = ((dict(services), instruction, coordinates), body)
+
     async def check_api_token(self, force_renew=False):
-        """Check if server token is valid."""
-        return bool(self.server_token)
+        """Check if server token is valid, using the cached result if fresh."""
+        if not self.server_token:
+            return False
+        return await self.token_validator.async_check(force=force_renew) is not False
 
-    async def update_alarm_status(self):
-        """Update the status of the current alarm."""
-        if self._alarm is not None:
-            try:
-                url = f"{self.api_endpoint}/alarms/{self._alarm['id']}/status"
-                async with self._websession.get(url, headers=self.headers) as resp:
-                    if resp.status == 200:
-                        alarm_data = await resp.json()
-                        self._alarm.update(alarm_data)
-                        return alarm_data.get("status")
-            except Exception as e:
-                _LOGGER.error(f"Failed to update alarm status: {e}")
-        return None
+    @property
+    def token_valid(self):
+        """Return the cached token check; unknown counts as valid."""
+        return bool(self.server_token) and self.token_validator.valid is not False
+
+    def _on_duplicate_alarm(self, alarm):
+        """Cancel an extra alarm created by a hedged delivery attempt."""
+        self.hass.async_create_task(self.async_cancel_alarm(alarm.get("id")))
+
+    async def async_cancel_alarm(self, alarm_id):
+        """Cancel an alarm by id using the PIN."""
+        try:
+            await self.api.async_cancel_alarm(alarm_id, self.pin)
+        except NoonlightApiError as e:
+            _LOGGER.error(f"Failed to cancel alarm {alarm_id}: {e}")
+            return False
+        return True
+
+    async def update_alarm_status(self, alarm_id=None):
+        """Update the status of an alarm, by default the current one."""
+        if alarm_id is None:
+            if self._alarm is None:
+                return None
+            alarm_id = self._alarm.id
+        with self.tracer.span("update_alarm_status", alarm_id=alarm_id) as span:
+            with span.phase("request"):
+                alarm_data = await self._async_get_alarm_status(alarm_id)
+            if not isinstance(alarm_data, dict):
+                raise StatusPollError(
+                    f"Unexpected status response for alarm {alarm_id}: {alarm_data!r}"
+                )
+            alarm_data.setdefault("id", alarm_id)
+            with span.phase("apply"):
+                if not self.async_handle_status_update(alarm_data):
+                    # Refresh the last contact and alarm age
+                    self.coordinator.async_push()
+        return alarm_data.get("status")
+
+    async def async_confirm_status(self, alarm_id, status):
+        """Poll an alarm that a status callback reported a change for.
+
+        Only the polled status is applied. Polling slows to the fallback
+        once a poll agrees with the status a callback reported.
+        """
+        if alarm_id in self._confirming:
+            return
+        self._confirming.add(alarm_id)
+        try:
+            polled = await self.update_alarm_status(alarm_id)
+        except StatusPollError as e:
+            _LOGGER.warning(f"Unable to confirm status of alarm {alarm_id}: {e}")
+            return
+        finally:
+            self._confirming.discard(alarm_id)
+        if polled == status:
+            self.poll_settings.push_confirmed = True
+        else:
+            _LOGGER.warning(
+                f"Noonlight webhook reported {status} for alarm {alarm_id}, "
+                f"but the API reports {polled}"
+            )
+
+    async def _async_get_alarm_status(self, alarm_id):
+        """Fetch an alarm status, raising StatusPollError on failure."""
+        try:
+            return await self.api.async_get_alarm_status(alarm_id)
+        except NoonlightApiError as e:
+            raise StatusPollError(str(e), retry_after=e.retry_after) from e
+
+    @callback
+    def async_handle_status_update(self, alarm_data):
+        """Apply a status update from polling or the webhook.
+
+        Return whether the alarm changed and entities were updated.
+        """
+        alarm_id = alarm_data.get("id")
+        alarm = self.alarms.get(alarm_id)
+        if alarm is None:
+            _LOGGER.debug(f"Ignoring status update for unknown alarm: {alarm_data}")
+            return False
+
+        if not alarm.apply(alarm_data):
+            return False
+        if alarm.status in CONST_ALARM_TERMINAL_STATUSES:
+            _LOGGER.debug("Alarm %s is %s", alarm_id, alarm.status)
+            self.poller.untrack(alarm_id)
+            self._finish_alarm(alarm_id)
+        else:
+            self.coordinator.async_push()
+        return True
+
+    @callback
+    def _on_alarm_expired(self, alarm_id):
+        """Forget an alarm that outlived the maximum tracking time."""
+        _LOGGER.warning(
+            f"Alarm {alarm_id} is no longer tracked: maximum alarm lifetime reached"
+        )
+        self._finish_alarm(alarm_id)
+
+    @callback
+    def _finish_alarm(self, alarm_id):
+        """Move an alarm to the history and update the entities."""
+        self.outbox.remove_alarm(alarm_id)
+        if self.alarms.finish(alarm_id) is None:
+            return
+        if self._alarm is None:
+            self.event_forwarder.stop()
+            self.location_updater.stop()
+        else:
+            self.event_forwarder.start(self._alarm.id)
+            self.location_updater.start(self._alarm.id)
+        self.coordinator.async_push()
+
+    async def async_update_alarm(self, alarm_id, services=None, instruction=None):
+        """Update the services and/or instructions of an active alarm."""
+        return await self.api.async_update_alarm(alarm_id, services, instruction)
+
+    async def async_create_alarm_events(self, alarm_id, events):
+        """Submit a batch of events to an active alarm."""
+        await self.api.async_create_events(alarm_id, events)
+        _LOGGER.debug(f"Sent {len(events)} event(s) to alarm {alarm_id}")
+
+    async def async_update_alarm_location(self, alarm_id, coordinates):
+        """Report a new location for an active alarm."""
+        await self.api.async_update_location(alarm_id, coordinates)
+        _LOGGER.debug(f"Updated location of alarm {alarm_id}: {coordinates}")
 
     async def create_alarm(self, alarm_types=["police"], instruction: str | None = None):
-        """Create a new alarm using direct Noonlight API."""
+        """Create a new alarm using direct Noonlight API.
+
+        Concurrent calls share one in-flight creation: later callers wait
+        for the same alarm, and any services they add are applied to it
+        once it exists. A call while an alarm is active escalates it.
+        """
+        alarm, _ = await self.async_request_alarm(alarm_types, instruction)
+        return alarm
+
+    async def async_request_alarm(self, alarm_types, instruction=None):
+        """Create or escalate an alarm; return the alarm and the outcome.
+
+        The outcome is one of the `ALARM_RESULT_*` constants.
+        """
         services = {}
         for alarm_type in alarm_types or ():
-            if alarm_type in ["police", "fire", "medical"]:
+            if alarm_type in CONST_NOONLIGHT_SERVICE_TYPES:
                 services[alarm_type] = True
+        return await self._async_create_shared(services, instruction)
+
+    async def _async_create_shared(self, services, instruction, intent_id=None):
+        """Create an alarm or join the request that is already in flight."""
+        if self._create_future is not None:
+            _LOGGER.debug(f"Joining in-flight alarm request, services: {services}")
+            self._pending_services.update(services)
+            if instruction and not self._pending_instruction:
+                self._pending_instruction = instruction
+            if intent_id is not None:
+                self.outbox.discard_intent(intent_id)
+            alarm = await asyncio.shield(self._create_future)
+            return alarm, ALARM_RESULT_JOINED if alarm else ALARM_RESULT_FAILED
+
+        alarm = self._alarm
+        if alarm is not None:
+            if intent_id is not None:
+                self.outbox.discard_intent(intent_id)
+            extra_services = {
+                service: True
+                for service in services
+                if not alarm.services.get(service)
+            }
+            if instruction in alarm.instructions:
+                instruction = None
+            if not extra_services and not instruction:
+                return alarm, ALARM_RESULT_UNCHANGED
+
+        self._create_future = self.hass.loop.create_future()
+        self._pending_services = {}
+        self._pending_instruction = None
+        try:
+            if alarm is None:
+                alarm = await self._async_create_alarm(services, instruction, intent_id)
+                result = ALARM_RESULT_CREATED if alarm else ALARM_RESULT_FAILED
+            elif await self._async_escalate_alarm(alarm, extra_services, instruction):
+                services = alarm.services
+                result = ALARM_RESULT_ESCALATED
+            else:
+                result = ALARM_RESULT_FAILED
+            if result != ALARM_RESULT_FAILED:
+                await self._async_apply_pending(alarm, services, instruction)
+        finally:
+            self._create_future.set_result(self._alarm)
+            self._create_future = None
+        return alarm, result
+
+    async def _async_escalate_alarm(self, alarm, services, instruction):
+        """Add services and/or an instruction to an active alarm in one request."""
+        _LOGGER.info(f"Escalating alarm {alarm.id} with {list(services)}")
+        try:
+            await self.async_update_alarm(
+                alarm.id,
+                services={**alarm.services, **services} if services else None,
+                instruction=instruction,
+            )
+        except NoonlightApiError as e:
+            persistent_notification.create(
+                self.hass,
+                f"Failed to add {list(services)} to the active Noonlight alarm!"
+                f"\n\n({e})",
+                "Noonlight Alarm Failure",
+                f"{NOTIFICATION_ALARM_CREATE_FAILURE}_{self.entry_id}",
+            )
+            return False
+        if instruction:
+            alarm.instructions.add(instruction)
+        if alarm.apply({"services": {**alarm.services, **services}}):
+            self.coordinator.async_push()
+        return True
 
-        if self._alarm is None:
-            try:
-                # Determine name (user_name preferred, fallback to Alarm System)
-                user_name = self.config.get("user_name")
-                alarm_name = user_name if user_name else "Alarm System"
-
-                # Base payload
-                alarm_body = {
-                    "name": alarm_name,
-                    "phone": self.config[CONF_PHONE_NUMBER],
-                }
-
-                # Add PIN
-                if self.pin:
-                    alarm_body["pin"] = self.pin
-
-                # Add address or coordinates
-                if len(self.addline1) > 0:
-                    alarm_body["location"] = {
-                        "address": {
-                            "line1": self.addline1,
-                            "city": self.addcity,
-                            "state": self.addstate,
-                            "zip": self.addzip,
-                            "country": self.addcountry,
-                        }
-                    }
-                    if len(self.addline2) > 0:
-                        alarm_body["location"]["address"]["line2"] = self.addline2
-                else:
-                    alarm_body["location"] = {
-                        "coordinates": {
-                            "lat": self.latitude,
-                            "lng": self.longitude,
-                            "accuracy": 5,
-                        }
-                    }
-
-                # Add services
-                if len(services) > 0:
-                    alarm_body["services"] = services
-
-                # Add instruction 
-                if instruction:
-                    alarm_body["instructions"] = {"entry": instruction}
-
-                # Send API request
-                url = f"{self.api_endpoint}/alarms"
-                async with self._websession.post(
-                    url, json=alarm_body, headers=self.headers
-                ) as resp:
-                    if resp.status == 201:
-                        self._alarm = await resp.json()
-                        _LOGGER.info(
-                            f"Alarm created successfully: {self._alarm.get('id')}"
-                        )
-                    else:
-                        error_text = await resp.text()
-                        raise Exception(f"API returned {resp.status}: {error_text}")
-
-            except Exception as client_error:
-                persistent_notification.create(
-                    self.hass,
-                    "Failed to send an alarm to Noonlight!\n\n"
-                    f"({type(client_error).__name__}: {client_error})",
-                    "Noonlight Alarm Failure",
-                    NOTIFICATION_ALARM_CREATE_FAILURE,
-                )
+    @callback
+    def _schedule_outbox_retry(self, delay=OUTBOX_RETRY_INTERVAL.total_seconds()):
+        """Retry unsent alarm intents in the background."""
+        if self._cancel_outbox_retry is None:
+            self._cancel_outbox_retry = async_call_later(
+                self.hass, delay, self._async_retry_outbox
+            )
+
+    async def _async_retry_outbox(self, now):
+        """Send alarm intents that failed or were interrupted by a restart."""
+        self._cancel_outbox_retry = None
+        for intent_id, intent in self.outbox.pending_intents():
+            _LOGGER.info(f"Retrying alarm intent {intent_id}: {intent['services']}")
+            await self._async_create_shared(
+                intent["services"], intent["instruction"], intent_id
+            )
+        if self.outbox.intents:
+            self._schedule_outbox_retry()
+
+    async def _async_apply_pending(self, alarm, services, instruction):
+        """Add services/instructions requested while the alarm was being sent."""
+        applied = dict(services)
+        while True:
+            extra_services = {
+                service: True
+                for service in self._pending_services
+                if service not in applied
+            }
+            extra_instruction = None if instruction else self._pending_instruction
+            if extra_instruction in alarm.instructions:
+                extra_instruction = None
+            if not extra_services and not extra_instruction:
                 return
 
-            # Active alarm monitoring
-            if self._alarm and self._alarm.get("status") == CONST_ALARM_STATUS_ACTIVE:
-                async_dispatcher_send(self.hass, EVENT_NOONLIGHT_ALARM_CREATED)
-                _LOGGER.debug(
-                    "Noonlight alarm initiated. id: %s status: %s",
-                    self._alarm.get("id"),
-                    self._alarm.get("status"),
+            try:
+                await self.async_update_alarm(
+                    alarm.id,
+                    services={**applied, **extra_services},
+                    instruction=extra_instruction,
                 )
-
-                cancel_interval = None
-
-                async def check_alarm_status_interval(now):
-                    _LOGGER.debug("Checking alarm status...")
-                    if (
-                        await self.update_alarm_status()
-                        == CONST_ALARM_STATUS_CANCELED
-                    ):
-                        _LOGGER.debug(
-                            "Alarm %s has been canceled!", self._alarm.get("id")
-                        )
-                        if cancel_interval is not None:
-                            cancel_interval()
-                        if self._alarm and self._alarm.get("status") == CONST_ALARM_STATUS_CANCELED:
-                            self._alarm = None
-                        async_dispatcher_send(self.hass, EVENT_NOONLIGHT_ALARM_CANCELED)
-
-                cancel_interval = async_track_time_interval(
-                    self.hass, check_alarm_status_interval, timedelta(seconds=15)
+            except Exception as e:
+                _LOGGER.error(
+                    f"Failed to add {list(extra_services)} to alarm {alarm.id}: {e}"
                 )
+                return
+            applied.update(extra_services)
+            instruction = instruction or extra_instruction
+            if extra_instruction:
+                alarm.instructions.add(extra_instruction)
+            if alarm.apply({"services": {**alarm.services, **extra_services}}):
+                self.coordinator.async_push()
+
+    async def _async_create_alarm(self, services, instruction, intent_id=None):
+        """Send the alarm and start tracking it."""
+        with self.tracer.span("create_alarm", services=list(services)) as span:
+            return await self._async_create_alarm_traced(
+                span, services, instruction, intent_id
+            )
+
+    async def _async_create_alarm_traced(self, span, services, instruction, intent_id):
+        """Send the alarm and start tracking it, timing each phase."""
+        if intent_id is None:
+            intent_id = self.outbox.add_intent(services, instruction)
+        coordinates = self.location_updater.current_coordinates()
+        try:
+            with span.phase("payload_build"):
+                alarm_body = self._build_alarm_body(services, instruction, coordinates)
+            with span.phase("delivery"), self.metrics.measure("create") as measurement:
+                alarm_data = await self._delivery.async_send(alarm_body, intent_id)
+                measurement.status = 201
+            alarm = NoonlightAlarm.from_api(alarm_data, self.entry_id)
+            if not alarm.services:
+                alarm.services = dict(services)
+            if instruction:
+                alarm.instructions.add(instruction)
+            _LOGGER.info(f"Alarm created successfully: {alarm.id}")
+        except Exception as client_error:
+            if (
+                isinstance(client_error, AlarmDeliveryError)
+                and not client_error.retryable
+            ):
+                _LOGGER.error(f"Noonlight refused the alarm: {client_error}")
+                self.outbox.discard_intent(intent_id)
+            else:
+                self._schedule_outbox_retry()
+            persistent_notification.create(
+                self.hass,
+                "Failed to send an alarm to Noonlight!\n\n"
+                f"({type(client_error).__name__}: {client_error})",
+                "Noonlight Alarm Failure",
+                f"{NOTIFICATION_ALARM_CREATE_FAILURE}_{self.entry_id}",
+            )
+            return None
+
+        self.outbox.complete_intent(intent_id, alarm)
+        self.alarms.add(alarm)
+        if alarm.status in CONST_ALARM_TERMINAL_STATUSES:
+            self._finish_alarm(alarm.id)
+            return alarm
+
+        # Active alarm monitoring
+        self.poller.track(alarm.id, self.poll_settings)
+        self.event_forwarder.start(alarm.id)
+        self.location_updater.start(alarm.id, coordinates)
+        with span.phase("entity_update"):
+            self.coordinator.async_push()
+        if alarm.status == CONST_ALARM_STATUS_ACTIVE:
+            _LOGGER.debug(
+                "Noonlight alarm initiated. id: %s status: %s",
+                alarm.id,
+                alarm.status,
+            )
+        return alarm
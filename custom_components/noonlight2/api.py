@@ -0,0 +1,332 @@
+"""Lightweight async client for the Noonlight dispatch API."""
+
+import contextlib
+import json
+import logging
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+import homeassistant.util.dt as dt_util
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    API_CONNECT_TIMEOUT,
+    API_REQUEST_TIMEOUT,
+    CONST_ALARM_STATUS_CANCELED,
+    TOKEN_CHECK_ALARM_ID,
+    TOKEN_CHECK_TIMEOUT,
+)
+from .ratelimit import (
+    PRIORITY_ALARM,
+    PRIORITY_STATUS,
+    PRIORITY_TELEMETRY,
+    RateLimitExceeded,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rate limiter priority of each operation; others are telemetry
+OPERATION_PRIORITIES = {
+    "create_attempt": PRIORITY_ALARM,
+    "update": PRIORITY_ALARM,
+    "cancel": PRIORITY_ALARM,
+    "status": PRIORITY_STATUS,
+    "token_check": PRIORITY_STATUS,
+    "people": PRIORITY_STATUS,
+}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0.0)
+
+
+class NoonlightApiError(HomeAssistantError):
+    """A Noonlight API request failed.
+
+    `status` is the HTTP status, or None when no response was received.
+    `retry_after` is the server's `Retry-After` hint in seconds.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status: int | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class EndpointUnreachable(NoonlightApiError):
+    """No connection could be opened, so the request was never sent."""
+
+
+class NoonlightClient:
+    """Async client for the Noonlight dispatch API.
+
+    Requests go through the transport's pooled session to the best
+    endpoint of its pool. The client encodes request bodies, maps
+    connection errors and unexpected statuses to `NoonlightApiError`,
+    and measures every call in `metrics`. Requests wait for `limiter`
+    by the priority of their operation. The outcome of each request is
+    recorded for its endpoint. A request fails over to the next endpoint
+    when the connection could not be opened, and for reads also after a
+    timeout or 5xx response. Writes are left to the caller's retries,
+    which then go to the next-ranked endpoint.
+    """
+
+    def __init__(self, transport, server_token: str, metrics, limiter) -> None:
+        """Initialize the client."""
+        self._transport = transport
+        self._endpoints = transport.endpoints
+        self.metrics = metrics
+        self.limiter = limiter
+        self.headers = {
+            "Authorization": f"Bearer {server_token}",
+            "Content-Type": "application/json",
+        }
+
+    async def _async_request(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        alarm_id: str | None = None,
+        body=None,
+        expected: tuple[int, ...] = (200, 201),
+        headers: dict | None = None,
+        timeout: float | None = None,
+        json_response: bool = False,
+    ):
+        """Make one request and return the decoded JSON response, if any.
+
+        `body` may be pre-encoded bytes or any JSON-serializable value.
+        With `json_response`, a response that is not valid JSON raises
+        `NoonlightApiError` instead of returning None.
+        """
+        if body is None or isinstance(body, bytes):
+            data = body
+        else:
+            data = json.dumps(body, separators=(",", ":")).encode()
+        client_timeout = aiohttp.ClientTimeout(
+            total=timeout or API_REQUEST_TIMEOUT, sock_connect=API_CONNECT_TIMEOUT
+        )
+        priority = OPERATION_PRIORITIES.get(operation, PRIORITY_TELEMETRY)
+        try:
+            await self.limiter.async_acquire(priority)
+        except RateLimitExceeded as e:
+            raise NoonlightApiError(
+                str(e), status=429, retry_after=e.retry_after
+            ) from e
+        loop = self._transport.hass.loop
+        endpoints = self._endpoints.ranked()
+        # Alarm writes may use the connection kept free of other requests
+        slot = (
+            contextlib.nullcontext()
+            if priority == PRIORITY_ALARM
+            else self._transport.deferrable
+        )
+        async with slot:
+            for index, endpoint in enumerate(endpoints):
+                start = loop.time()
+                try:
+                    result = await self._async_request_endpoint(
+                        endpoint,
+                        operation,
+                        method,
+                        path,
+                        alarm_id,
+                        body,
+                        data,
+                        expected,
+                        headers,
+                        client_timeout,
+                        json_response,
+                    )
+                except NoonlightApiError as e:
+                    if e.status is not None and e.status < 500:
+                        # The endpoint works; the request itself was refused
+                        self._endpoints.record_success(endpoint, loop.time() - start)
+                        if e.status == 429:
+                            self.limiter.record_throttled(e.retry_after)
+                        raise
+                    self._endpoints.record_failure(endpoint, loop.time() - start)
+                    if index == len(endpoints) - 1 or not (
+                        isinstance(e, EndpointUnreachable) or method == "GET"
+                    ):
+                        raise
+                    _LOGGER.warning(
+                        f"Noonlight endpoint {endpoint} failed ({e}), "
+                        f"trying {endpoints[index + 1]}"
+                    )
+                    continue
+                self._endpoints.record_success(endpoint, loop.time() - start)
+                self.limiter.record_success()
+                return result
+
+    async def _async_request_endpoint(
+        self,
+        endpoint,
+        operation,
+        method,
+        path,
+        alarm_id,
+        body,
+        data,
+        expected,
+        headers,
+        client_timeout,
+        json_response,
+    ):
+        """Make one request to one endpoint."""
+        try:
+            with self.metrics.measure(
+                operation, f"{method} {path}", alarm_id, body
+            ) as measurement:
+                async with self._transport.session.request(
+                    method,
+                    f"{endpoint}{path}",
+                    data=data,
+                    headers=headers or self.headers,
+                    timeout=client_timeout,
+                    trace_request_ctx={"operation": operation},
+                ) as resp:
+                    measurement.status = resp.status
+                    if resp.status not in expected:
+                        error_text = await resp.text()
+                        raise NoonlightApiError(
+                            f"API returned {resp.status}: {error_text}",
+                            status=resp.status,
+                            retry_after=parse_retry_after(
+                                resp.headers.get("Retry-After")
+                            ),
+                        )
+                    if resp.content_type == "application/json":
+                        try:
+                            return await resp.json()
+                        except ValueError as e:
+                            raise NoonlightApiError(
+                                f"API returned invalid JSON: {e}", status=resp.status
+                            ) from e
+                    if json_response:
+                        raise NoonlightApiError(
+                            f"API returned {resp.content_type or 'no content'} "
+                            "instead of JSON",
+                            status=resp.status,
+                        )
+                    return None
+        except (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError) as e:
+            raise EndpointUnreachable(f"{type(e).__name__}: {e}") from e
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise NoonlightApiError(f"{type(e).__name__}: {e}") from e
+
+    async def async_create_alarm(
+        self, body: bytes, headers: dict | None = None, timeout: float | None = None
+    ) -> dict:
+        """Create an alarm from an encoded body; `POST /alarms`."""
+        return await self._async_request(
+            "create_attempt",
+            "POST",
+            "/alarms",
+            body=body,
+            expected=(201,),
+            headers=headers,
+            timeout=timeout,
+            json_response=True,
+        )
+
+    async def async_validate_token(self) -> bool | None:
+        """Return whether the server token is accepted; None if unreachable.
+
+        There is no token endpoint, so this asks for the status of an alarm
+        that does not exist: 404 means the token was accepted and 401 or
+        403 that it was rejected. Anything else, including throttling and
+        server errors, says nothing about the token.
+        """
+        try:
+            await self._async_request(
+                "token_check",
+                "GET",
+                f"/alarms/{TOKEN_CHECK_ALARM_ID}/status",
+                expected=(200,),
+                timeout=TOKEN_CHECK_TIMEOUT,
+            )
+        except NoonlightApiError as e:
+            if e.status in (401, 403):
+                return False
+            if e.status == 404:
+                return True
+            return None
+        return True
+
+    async def async_get_alarm_status(self, alarm_id: str) -> dict:
+        """Return the status of an alarm; `GET /alarms/{id}/status`."""
+        return await self._async_request(
+            "status",
+            "GET",
+            f"/alarms/{alarm_id}/status",
+            alarm_id,
+            expected=(200,),
+            json_response=True,
+        )
+
+    async def async_cancel_alarm(self, alarm_id: str, pin: str) -> None:
+        """Cancel an alarm with the PIN; `POST /alarms/{id}/status`."""
+        await self._async_request(
+            "cancel",
+            "POST",
+            f"/alarms/{alarm_id}/status",
+            alarm_id,
+            {"status": CONST_ALARM_STATUS_CANCELED, "pin": pin},
+        )
+
+    async def async_update_alarm(
+        self,
+        alarm_id: str,
+        services: dict | None = None,
+        instruction: str | None = None,
+    ) -> dict:
+        """Update the services and/or instructions; `PATCH /alarms/{id}`."""
+        body = {}
+        if services:
+            body["services"] = services
+        if instruction:
+            body["instructions"] = {"entry": instruction}
+        return await self._async_request(
+            "update", "PATCH", f"/alarms/{alarm_id}", alarm_id, body
+        )
+
+    async def async_create_events(self, alarm_id: str, events: list[dict]) -> None:
+        """Submit a batch of events; `POST /alarms/{id}/events`."""
+        await self._async_request(
+            "events", "POST", f"/alarms/{alarm_id}/events", alarm_id, events
+        )
+
+    async def async_update_location(self, alarm_id: str, coordinates: dict) -> None:
+        """Report a new location; `POST /alarms/{id}/locations`."""
+        await self._async_request(
+            "location",
+            "POST",
+            f"/alarms/{alarm_id}/locations",
+            alarm_id,
+            {"coordinates": coordinates},
+        )
+
+    async def async_add_people(self, alarm_id: str, people: list[dict]) -> None:
+        """Add people to contact about an alarm; `POST /alarms/{id}/people`."""
+        await self._async_request(
+            "people", "POST", f"/alarms/{alarm_id}/people", alarm_id, people
+        )
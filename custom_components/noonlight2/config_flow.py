@@ -1,4 +1,5 @@
 import logging
+import uuid
 from typing import TYPE_CHECKING, Any
 
 import homeassistant.helpers.config_validation as cv
@@ -6,7 +7,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.const import CONF_ID, CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
 
 from .const import (
@@ -22,10 +23,25 @@ from .const import (
     CONF_COUNTRY,
     CONF_USER_NAME,
     CONF_PIN,
+    CONF_EVENT_ENTITIES,
+    CONF_LOCATION_ENTITY,
+    CONF_MAX_ALARM_LIFETIME,
+    CONF_TRACING,
+    CONF_TRIGGER_RULES,
+    CONF_RULE_CONDITION_ENTITY,
+    CONF_RULE_CONDITION_STATE,
+    CONF_RULE_DELAY,
+    CONF_RULE_ENTITY,
+    CONF_RULE_SERVICE,
+    CONF_RULE_STATE,
+    CONST_NOONLIGHT_SERVICE_TYPES,
+    NOONLIGHT_SERVICES_POLICE,
     DEFAULT_API_ENDPOINT,
+    DEFAULT_MAX_ALARM_LIFETIME,
     DEFAULT_NAME,
     DOMAIN,
 )
+from .triggers import describe_rule
 
 _LOGGER = logging.getLogger(__name__)
 LOCATION_MODE_LIST = [
@@ -465,15 +481,150 @@ async def _async_build_address_schema_CA(
 
     return build_schema
 
+async def _async_build_options_schema(
+    hass: HomeAssistant, user_input: list, default_dict: list
+) -> Any:
+    """Gets the options schema using the default_dict as a backup."""
+    if user_input is None:
+        user_input = {}
+
+    def _get_default(key: str, fallback_default: Any = None) -> Any:
+        """Gets default value for key."""
+        return user_input.get(key, default_dict.get(key, fallback_default))
+
+    build_schema = vol.Schema(
+        {
+            # Stop tracking an alarm after this many hours
+            vol.Required(
+                CONF_MAX_ALARM_LIFETIME,
+                default=_get_default(
+                    CONF_MAX_ALARM_LIFETIME, DEFAULT_MAX_ALARM_LIFETIME
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=72,
+                    step=1,
+                    unit_of_measurement="h",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+
+            # Entities whose changes are sent to Noonlight during an alarm
+            vol.Optional(
+                CONF_EVENT_ENTITIES,
+                default=_get_default(CONF_EVENT_ENTITIES, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=["binary_sensor", "lock"],
+                    multiple=True,
+                )
+            ),
+
+            # Take the alarm location from a tracked entity
+            vol.Optional(
+                CONF_LOCATION_ENTITY,
+                description={"suggested_value": _get_default(CONF_LOCATION_ENTITY)},
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["device_tracker", "person"])
+            ),
+
+            # Trace the alarm path for the profile_alarm_path service
+            vol.Required(
+                CONF_TRACING,
+                default=_get_default(CONF_TRACING, False),
+            ): selector.BooleanSelector(),
+        }
+    )
+    return build_schema
+
+
+async def _async_build_rule_schema(
+    hass: HomeAssistant, user_input: list
+) -> Any:
+    """Gets the schema of a new trigger rule."""
+    if user_input is None:
+        user_input = {}
+
+    def _get_default(key: str, fallback_default: Any = None) -> Any:
+        """Gets default value for key."""
+        return user_input.get(key, fallback_default)
+
+    build_schema = vol.Schema(
+        {
+            # Entity whose change requests the alarm
+            vol.Required(
+                CONF_RULE_ENTITY,
+                description={"suggested_value": _get_default(CONF_RULE_ENTITY)},
+            ): selector.EntitySelector(selector.EntitySelectorConfig()),
+
+            # State that triggers the rule, such as "on" or "open"
+            vol.Required(
+                CONF_RULE_STATE,
+                default=_get_default(CONF_RULE_STATE, "on"),
+            ): selector.TextSelector(selector.TextSelectorConfig()),
+
+            # Noonlight service to request
+            vol.Required(
+                CONF_RULE_SERVICE,
+                default=_get_default(CONF_RULE_SERVICE, NOONLIGHT_SERVICES_POLICE),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=list(CONST_NOONLIGHT_SERVICE_TYPES),
+                    mode=selector.SelectSelectorMode.LIST,
+                )
+            ),
+
+            # Only fire while this entity is in the condition state
+            vol.Optional(
+                CONF_RULE_CONDITION_ENTITY,
+                description={
+                    "suggested_value": _get_default(CONF_RULE_CONDITION_ENTITY)
+                },
+            ): selector.EntitySelector(selector.EntitySelectorConfig()),
+            vol.Optional(
+                CONF_RULE_CONDITION_STATE,
+                description={
+                    "suggested_value": _get_default(CONF_RULE_CONDITION_STATE)
+                },
+            ): selector.TextSelector(selector.TextSelectorConfig()),
+
+            # Seconds to wait before requesting the alarm
+            vol.Required(
+                CONF_RULE_DELAY,
+                default=_get_default(CONF_RULE_DELAY, 0),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=600,
+                    step=1,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+        }
+    )
+    return build_schema
+
+
 class Noonlight2ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     def __init__(self):
         """Initialize."""
-        self._data = {}
+        # Entity unique ids end with the id, so each site needs its own
+        self._data = {CONF_ID: uuid.uuid4().hex}
         self._errors = {}
         self._entry = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return Noonlight2OptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None, yaml_import: bool = False
     ) -> ConfigFlowResult:
@@ -597,6 +748,8 @@ class Noonlight2ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 f"[Noonlight2] Invalid YAML Config. Cannot Import: {import_config}"
             )
             return
+        if self._async_current_entries():
+            return self.async_abort(reason="already_configured")
         _LOGGER.debug(f"[async_step_import] import_config: {import_config}")
         return await self.async_step_user(user_input=import_config, yaml_import=True)
 
@@ -695,3 +848,98 @@ class Noonlight2ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=self._errors,
         )
+
+
+class Noonlight2OptionsFlow(config_entries.OptionsFlow):
+    """Handle Noonlight2 options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Choose which options to manage."""
+        menu_options = ["settings", "add_rule"]
+        if self.config_entry.options.get(CONF_TRIGGER_RULES):
+            menu_options.append("remove_rules")
+        return self.async_show_menu(step_id="init", menu_options=menu_options)
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+
+        if user_input is not None:
+            _LOGGER.debug(f"[async_step_settings] options: {user_input}")
+            options = {**self.config_entry.options, **user_input}
+            if CONF_LOCATION_ENTITY not in user_input:
+                options.pop(CONF_LOCATION_ENTITY, None)
+            return self.async_create_entry(data=options)
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=await _async_build_options_schema(
+                self.hass, user_input, dict(self.config_entry.options)
+            ),
+        )
+
+    async def async_step_add_rule(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add a rule that requests an alarm when an entity changes."""
+        errors = {}
+        if user_input is not None:
+            _LOGGER.debug(f"[async_step_add_rule] rule: {user_input}")
+            if bool(user_input.get(CONF_RULE_CONDITION_ENTITY)) != bool(
+                user_input.get(CONF_RULE_CONDITION_STATE)
+            ):
+                errors["base"] = "incomplete_condition"
+            else:
+                rules = list(self.config_entry.options.get(CONF_TRIGGER_RULES, []))
+                rules.append(user_input)
+                return self.async_create_entry(
+                    data={**self.config_entry.options, CONF_TRIGGER_RULES: rules}
+                )
+
+        return self.async_show_form(
+            step_id="add_rule",
+            data_schema=await _async_build_rule_schema(self.hass, user_input),
+            errors=errors,
+        )
+
+    async def async_step_remove_rules(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Remove trigger rules."""
+        rules = self.config_entry.options.get(CONF_TRIGGER_RULES, [])
+        if user_input is not None:
+            removed = set(user_input.get(CONF_TRIGGER_RULES, []))
+            return self.async_create_entry(
+                data={
+                    **self.config_entry.options,
+                    CONF_TRIGGER_RULES: [
+                        rule
+                        for index, rule in enumerate(rules)
+                        if str(index) not in removed
+                    ],
+                }
+            )
+
+        rule_options = [
+            selector.SelectOptionDict(label=describe_rule(rule), value=str(index))
+            for index, rule in enumerate(rules)
+        ]
+        return self.async_show_form(
+            step_id="remove_rules",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_TRIGGER_RULES, default=[]
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=rule_options,
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        )
+                    ),
+                }
+            ),
+        )
@@ -1,14 +1,13 @@
+from datetime import timedelta
+
 from homeassistant.const import Platform
-from noonlight import (
-    NOONLIGHT_SERVICES_FIRE,
-    NOONLIGHT_SERVICES_MEDICAL,
-    NOONLIGHT_SERVICES_POLICE,
-)
 
 VERSION = "2.0.1"
 DOMAIN = "noonlight2"
 
-PLATFORMS = [Platform.SWITCH]
+PLATFORMS = [Platform.SENSOR, Platform.SWITCH]
+# hass.data key of the resources shared by all config entries
+DATA_HUB = f"{DOMAIN}_hub"
 
 DEFAULT_NAME = "Noonlight2"
 DEFAULT_API_ENDPOINT = "https://api.noonlight.com/dispatch/v1"
@@ -25,21 +24,144 @@ CONF_STATE = "state"
 CONF_ZIP = "zip"
 CONF_COUNTRY = "country"
 CONF_LOCATION_MODE = "location_mode"
+CONF_MAX_ALARM_LIFETIME = "max_alarm_lifetime"
+CONF_EVENT_ENTITIES = "event_entities"
+CONF_LOCATION_ENTITY = "location_entity"
+CONF_TRACING = "tracing"
+CONF_TRIGGER_RULES = "trigger_rules"
+# Keys of one trigger rule in CONF_TRIGGER_RULES
+CONF_RULE_ENTITY = "entity_id"
+CONF_RULE_STATE = "to_state"
+CONF_RULE_SERVICE = "service"
+CONF_RULE_CONDITION_ENTITY = "condition_entity_id"
+CONF_RULE_CONDITION_STATE = "condition_state"
+CONF_RULE_DELAY = "delay"
+
+DEFAULT_MAX_ALARM_LIFETIME = 12  # hours
 
 CONST_ALARM_STATUS_ACTIVE = "ACTIVE"
 CONST_ALARM_STATUS_CANCELED = "CANCELED"
+CONST_ALARM_STATUS_CLOSED = "CLOSED"
+CONST_ALARM_TERMINAL_STATUSES = (
+    CONST_ALARM_STATUS_CANCELED,
+    CONST_ALARM_STATUS_CLOSED,
+)
 CONST_NOONLIGHT_HA_SERVICE_CREATE_ALARM = "create_alarm"
+CONST_NOONLIGHT_HA_SERVICE_PROFILE_ALARM_PATH = "profile_alarm_path"
+CONST_NOONLIGHT_HA_SERVICE_CANCEL_COUNTDOWN = "cancel_countdown"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Outcome of an alarm request, returned by the create_alarm service
+ALARM_RESULT_CREATED = "created"
+ALARM_RESULT_ESCALATED = "escalated"
+ALARM_RESULT_JOINED = "joined"
+ALARM_RESULT_UNCHANGED = "unchanged"
+ALARM_RESULT_FAILED = "failed"
+ALARM_RESULT_COUNTDOWN = "countdown"
+
+# Seconds before a countdown ends at which the connection is warmed again
+COUNTDOWN_WARM_LEAD = 3
+
+# Status poll interval (seconds) by alarm age, slowing down as it ages
+ALARM_POLL_SCHEDULE = (
+    (timedelta(minutes=1), 2),
+    (timedelta(minutes=5), 5),
+    (timedelta(minutes=30), 15),
+)
+ALARM_POLL_MAX_INTERVAL = 60
+ALARM_POLL_ERROR_BACKOFF_MAX = 300
+# Alarms due within this many seconds are polled in the same tick
+ALARM_POLL_COALESCE_WINDOW = 1
+ALARM_POLL_CONCURRENCY = 4
+# Finished alarms kept in the registry
+ALARM_HISTORY_SIZE = 20
 
+OUTBOX_STORAGE_VERSION = 1
+# Delay (seconds) used to coalesce outbox writes
+OUTBOX_SAVE_DELAY = 1
+OUTBOX_RETRY_INTERVAL = timedelta(seconds=15)
+# Unsent alarms are retried in the background until this long after the request
+OUTBOX_INTENT_DEADLINE = timedelta(minutes=10)
+# Safety-net polling while status callbacks arrive through the webhook
+ALARM_STATUS_FALLBACK_INTERVAL = timedelta(minutes=2)
+
+NOONLIGHT_SERVICES_POLICE = "police"
+NOONLIGHT_SERVICES_FIRE = "fire"
+NOONLIGHT_SERVICES_MEDICAL = "medical"
 CONST_NOONLIGHT_SERVICE_TYPES = (
     NOONLIGHT_SERVICES_POLICE,
     NOONLIGHT_SERVICES_FIRE,
     NOONLIGHT_SERVICES_MEDICAL,
 )
 
-EVENT_NOONLIGHT_TOKEN_REFRESHED = "noonlight2_token_refreshed"
-EVENT_NOONLIGHT_ALARM_CANCELED = "noonlight2_alarm_canceled"
-EVENT_NOONLIGHT_ALARM_CREATED = "noonlight2_alarm_created"
+TOKEN_CHECK_INTERVAL = timedelta(minutes=15)
+# Alarm id used to probe the token; any answer but 401/403 means it is valid
+TOKEN_CHECK_ALARM_ID = "token-check"
+TOKEN_CHECK_TIMEOUT = 10
+
+# Dispatcher signals, formatted with the config entry id
+EVENT_NOONLIGHT_TOKEN_REFRESHED = "noonlight2_token_refreshed_{}"
 
 NOTIFICATION_TOKEN_UPDATE_FAILURE = "noonlight2_token_update_failure"
 NOTIFICATION_TOKEN_UPDATE_SUCCESS = "noonlight2_token_update_success"
 NOTIFICATION_ALARM_CREATE_FAILURE = "noonlight2_alarm_create_failure"
+
+TRANSPORT_CONNECTION_LIMIT = 4
+TRANSPORT_DNS_CACHE_TTL = 300
+TRANSPORT_KEEPALIVE_INTERVAL = timedelta(seconds=30)
+TRANSPORT_KEEPALIVE_TIMEOUT = 90
+TRANSPORT_RECONNECT_MIN_DELAY = 2
+TRANSPORT_RECONNECT_MAX_DELAY = 30
+TRANSPORT_WARM_TIMEOUT = 10
+
+# Default total and connect timeouts (seconds) of an API request
+API_REQUEST_TIMEOUT = 15
+API_CONNECT_TIMEOUT = 3
+
+# Endpoint failover: requests kept per endpoint for ranking, seconds added
+# to an endpoint's score per unit of error rate, consecutive failures that
+# open its circuit and how long (seconds) it stays open before a probe
+ENDPOINT_WINDOW_SIZE = 20
+ENDPOINT_ERROR_PENALTY = 5
+ENDPOINT_FAILURE_THRESHOLD = 3
+ENDPOINT_OPEN_MIN_DURATION = 30
+ENDPOINT_OPEN_MAX_DURATION = 300
+
+# Alarm delivery: total deadline and per-attempt timeout (seconds).
+# Hedging sends a second attempt when the first is slower than the delay;
+# it is off by default because a duplicate alarm has to be canceled.
+ALARM_DELIVERY_DEADLINE = 10
+ALARM_ATTEMPT_TIMEOUT = 4
+ALARM_BACKOFF_BASE = 0.25
+ALARM_BACKOFF_MAX = 2
+# Off: a hedged request may create a second alarm
+ALARM_HEDGE_DELAY = None
+
+# Outbound rate limit: steady rate (requests/s) and burst, spare tokens
+# kept per priority level for more urgent requests, rate floor and
+# recovery per accepted request after a 429, pause (seconds) after a 429
+# without Retry-After and longest wait before a deferrable request fails
+RATE_LIMIT_RATE = 5
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_RESERVE = 2
+RATE_LIMIT_MIN_RATE = 0.5
+RATE_LIMIT_RECOVERY = 0.1
+RATE_LIMIT_THROTTLE_DELAY = 5
+RATE_LIMIT_MAX_WAIT = 30
+
+# Alarm event forwarding: coalescing window (seconds) and in-flight cap
+EVENT_COALESCE_WINDOW = 1
+EVENT_MAX_IN_FLIGHT = 2
+
+# Location updates: minimum move (meters) and interval (seconds) between updates
+LOCATION_MIN_DISTANCE = 25
+LOCATION_MIN_INTERVAL = 10
+LOCATION_DEFAULT_ACCURACY = 5
+
+# Number of recent API calls kept per operation for latency/error metrics
+METRICS_WINDOW_SIZE = 100
+# Number of recent API request/response summaries kept for diagnostics
+EXCHANGE_LOG_SIZE = 50
+
+# Number of trace spans kept for the profile_alarm_path service
+TRACE_BUFFER_SIZE = 200
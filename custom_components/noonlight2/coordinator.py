@@ -0,0 +1,67 @@
+"""Data coordinator shared by the entities of one Noonlight site."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NoonlightCoordinator(DataUpdateCoordinator[dict]):
+    """Fan alarm state out to every entity of a config entry.
+
+    The coordinator never polls on its own. The integration pushes a new
+    snapshot after each status poll, status callback, alarm change and
+    countdown second, so adding entities adds no API calls. Entities
+    compare their own slice of the snapshot and only write state when it
+    changed.
+    """
+
+    def __init__(self, hass: HomeAssistant, noonlight_integration) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{noonlight_integration.entry_id}",
+            update_interval=None,
+        )
+        self.noonlight = noonlight_integration
+        self.data = self._snapshot()
+
+    async def _async_update_data(self) -> dict:
+        """Return the current snapshot; used for manual refreshes."""
+        return self._snapshot()
+
+    @callback
+    def async_push(self) -> None:
+        """Send a fresh snapshot to all entities."""
+        self.async_set_updated_data(self._snapshot())
+
+    def _snapshot(self) -> dict:
+        """Return the state entities are built from."""
+        alarm = self.noonlight._alarm
+        countdown = self.noonlight.countdown
+        if alarm is None:
+            return {
+                "alarm_id": None,
+                "status": None,
+                "services": frozenset(),
+                "created_at": None,
+                "last_contact": self.noonlight.metrics.last_contact,
+                "countdown": countdown.remaining,
+                "countdown_services": frozenset(countdown.services),
+            }
+        return {
+            "alarm_id": alarm.id,
+            "status": alarm.status,
+            "services": frozenset(
+                service for service, enabled in alarm.services.items() if enabled
+            ),
+            "created_at": alarm.created_at,
+            "last_contact": self.noonlight.metrics.last_contact,
+            "countdown": countdown.remaining,
+            "countdown_services": frozenset(countdown.services),
+        }
@@ -0,0 +1,180 @@
+"""Entry-delay countdown before a Noonlight alarm is sent."""
+
+import logging
+import math
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+
+from .const import COUNTDOWN_WARM_LEAD
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AlarmCountdown:
+    """The pending alarm of one config entry, sent when the countdown ends.
+
+    Timers are scheduled for points in time rather than intervals: one at
+    the deadline, one each whole second before it for the remaining
+    seconds, and one `COUNTDOWN_WARM_LEAD` seconds early to reopen the
+    connection and build the alarm body. Dispatch at the deadline then
+    needs neither a handshake nor serialization.
+
+    A countdown started while another is running adds its services and
+    keeps the earlier deadline. Each start may name a guard entity and
+    state, e.g. an alarm panel that must stay `armed_away`; the countdown
+    is canceled as soon as any guard leaves its state, or by `cancel()`
+    after the PIN was checked. Every entry has its own countdown, so
+    countdowns of different sites never interfere.
+    """
+
+    def __init__(self, hass: HomeAssistant, noonlight_integration) -> None:
+        """Initialize the countdown."""
+        self.hass = hass
+        self.noonlight = noonlight_integration
+        self.deadline = None
+        self.services: dict[str, bool] = {}
+        self.instruction = None
+        self._guards: dict[str, str] = {}
+        self._unsub_guards = None
+        self._cancel_deadline = None
+        self._cancel_tick = None
+        self._cancel_warm = None
+
+    @property
+    def active(self) -> bool:
+        """Return whether a countdown is running."""
+        return self.deadline is not None
+
+    @property
+    def remaining(self) -> int | None:
+        """Return the whole seconds left, rounded up."""
+        if self.deadline is None:
+            return None
+        seconds = (self.deadline - dt_util.utcnow()).total_seconds()
+        return max(math.ceil(seconds), 0)
+
+    @callback
+    def start(
+        self,
+        services: dict[str, bool],
+        seconds: float,
+        instruction: str | None = None,
+        guard_entity_id: str | None = None,
+        guard_state: str | None = None,
+    ) -> None:
+        """Start the countdown, or add to the one that is running."""
+        self.services.update(services)
+        if instruction and not self.instruction:
+            self.instruction = instruction
+        if guard_entity_id is not None:
+            self._guards[guard_entity_id] = guard_state
+            if self._unsub_guards is not None:
+                self._unsub_guards()
+            self._unsub_guards = async_track_state_change_event(
+                self.hass, list(self._guards), self._async_guard_changed
+            )
+
+        if self.deadline is None:
+            now = dt_util.utcnow()
+            self.deadline = now + timedelta(seconds=seconds)
+            _LOGGER.warning(
+                f"Noonlight alarm for {list(self.services)} in {seconds:g}s"
+            )
+            self._cancel_deadline = async_track_point_in_utc_time(
+                self.hass, self._async_deadline, self.deadline
+            )
+            warm_at = self.deadline - timedelta(seconds=COUNTDOWN_WARM_LEAD)
+            if warm_at > now:
+                self._cancel_warm = async_track_point_in_utc_time(
+                    self.hass, self._async_warm_before_deadline, warm_at
+                )
+            self._schedule_tick()
+        self.hass.async_create_task(self._async_warm())
+        self.noonlight.coordinator.async_push()
+
+    @callback
+    def cancel(self, reason: str) -> bool:
+        """Cancel the countdown; return whether one was running."""
+        if self.deadline is None:
+            return False
+        _LOGGER.warning(f"Noonlight alarm countdown canceled: {reason}")
+        self._clear()
+        self.noonlight.coordinator.async_push()
+        return True
+
+    @callback
+    def stop(self) -> None:
+        """Drop the countdown without sending the alarm."""
+        self._clear()
+
+    @callback
+    def _clear(self) -> None:
+        for cancel in (
+            self._unsub_guards,
+            self._cancel_deadline,
+            self._cancel_tick,
+            self._cancel_warm,
+        ):
+            if cancel is not None:
+                cancel()
+        self._unsub_guards = None
+        self._cancel_deadline = None
+        self._cancel_tick = None
+        self._cancel_warm = None
+        self._guards = {}
+        self.deadline = None
+        self.services = {}
+        self.instruction = None
+
+    @callback
+    def _schedule_tick(self) -> None:
+        """Update the remaining seconds when the next whole second passes."""
+        remaining = self.remaining
+        if remaining is None or remaining <= 1:
+            self._cancel_tick = None
+            return
+        self._cancel_tick = async_track_point_in_utc_time(
+            self.hass,
+            self._async_tick,
+            self.deadline - timedelta(seconds=remaining - 1),
+        )
+
+    @callback
+    def _async_tick(self, now) -> None:
+        self.noonlight.coordinator.async_push()
+        self._schedule_tick()
+
+    async def _async_warm_before_deadline(self, now) -> None:
+        self._cancel_warm = None
+        await self._async_warm()
+
+    async def _async_warm(self) -> None:
+        """Open the API connection and build the alarm body in advance."""
+        if self.deadline is None:
+            return
+        self.noonlight.prepare_alarm_body(self.services, self.instruction)
+        await self.noonlight.transport.async_warm()
+
+    @callback
+    def _async_guard_changed(self, event: Event) -> None:
+        """Cancel the countdown when a guard entity leaves its state."""
+        new_state = event.data.get("new_state")
+        entity_id = event.data["entity_id"]
+        if new_state is not None and new_state.state == self._guards.get(entity_id):
+            return
+        self.cancel(f"{entity_id} is {new_state.state if new_state else 'removed'}")
+
+    async def _async_deadline(self, now) -> None:
+        """Send the alarm when the countdown ends."""
+        services = self.services
+        instruction = self.instruction
+        self._cancel_deadline = None
+        self._clear()
+        self.noonlight.coordinator.async_push()
+        await self.noonlight.async_request_alarm(list(services), instruction)
@@ -0,0 +1,102 @@
+"""Background validation of the Noonlight server token."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.issue_registry import (
+    IssueSeverity,
+    async_create_issue,
+    async_delete_issue,
+)
+
+from .const import DOMAIN, EVENT_NOONLIGHT_TOKEN_REFRESHED, TOKEN_CHECK_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TokenValidator:
+    """Check the server token against the API and cache the result.
+
+    The result is kept for `TOKEN_CHECK_INTERVAL` and refreshed in the
+    background on the same schedule, so reading `valid` never makes a
+    request. `valid` is None until the first check gets an answer, and
+    an unreachable API keeps the last known result. When the result
+    changes, `EVENT_NOONLIGHT_TOKEN_REFRESHED` is sent for the entry and
+    a repair issue is raised or cleared.
+    """
+
+    def __init__(self, hass: HomeAssistant, client, entry_id: str, title: str) -> None:
+        """Initialize the validator."""
+        self.hass = hass
+        self._client = client
+        self._entry_id = entry_id
+        self._title = title
+        self.valid: bool | None = None
+        self.checked_at: float | None = None
+        self._cancel_refresh = None
+
+    @property
+    def _issue_id(self) -> str:
+        return f"invalid_token_{self._entry_id}"
+
+    @callback
+    def start(self) -> None:
+        """Refresh the cached result on a schedule."""
+        if self._cancel_refresh is None:
+            self._cancel_refresh = async_track_time_interval(
+                self.hass, self._async_refresh, TOKEN_CHECK_INTERVAL
+            )
+
+    @callback
+    def stop(self) -> None:
+        """Stop the scheduled refresh."""
+        if self._cancel_refresh is not None:
+            self._cancel_refresh()
+            self._cancel_refresh = None
+
+    async def _async_refresh(self, now) -> None:
+        await self.async_check(force=True)
+
+    async def async_check(self, force: bool = False) -> bool | None:
+        """Return whether the token is valid, checking the API when stale."""
+        now = self.hass.loop.time()
+        if (
+            not force
+            and self.checked_at is not None
+            and now - self.checked_at < TOKEN_CHECK_INTERVAL.total_seconds()
+        ):
+            return self.valid
+
+        valid = await self._client.async_validate_token()
+        if valid is None:
+            _LOGGER.debug("[token] Noonlight API unreachable, keeping last result")
+            return self.valid
+
+        self.checked_at = now
+        if valid != self.valid:
+            self.valid = valid
+            self._async_changed()
+        return self.valid
+
+    @callback
+    def _async_changed(self) -> None:
+        """Signal a new result and raise or clear the repair issue."""
+        if self.valid:
+            _LOGGER.info(f"Noonlight server token accepted for {self._title}")
+            async_delete_issue(self.hass, DOMAIN, self._issue_id)
+        else:
+            _LOGGER.error(f"Noonlight server token rejected for {self._title}")
+            async_create_issue(
+                self.hass,
+                DOMAIN,
+                self._issue_id,
+                is_fixable=False,
+                severity=IssueSeverity.ERROR,
+                translation_key="invalid_token",
+                translation_placeholders={"title": self._title},
+            )
+        async_dispatcher_send(
+            self.hass, EVENT_NOONLIGHT_TOKEN_REFRESHED.format(self._entry_id)
+        )
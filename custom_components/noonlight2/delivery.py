@@ -0,0 +1,184 @@
+"""Deadline-bounded delivery of Noonlight alarms."""
+
+import asyncio
+import logging
+import random
+import uuid
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .api import EndpointUnreachable, NoonlightApiError
+from .const import (
+    ALARM_ATTEMPT_TIMEOUT,
+    ALARM_BACKOFF_BASE,
+    ALARM_BACKOFF_MAX,
+    ALARM_DELIVERY_DEADLINE,
+    ALARM_HEDGE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AlarmDeliveryError(HomeAssistantError):
+    """The alarm could not be delivered to Noonlight.
+
+    `retryable` is False when sending the same alarm again cannot succeed,
+    such as when the request was refused as invalid or unauthorized.
+    """
+
+    def __init__(self, message, retryable: bool = True) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class _RetryableError(Exception):
+    """An attempt failed in a way that is safe to retry."""
+
+    def __init__(self, message, retry_after: float | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AlarmDelivery:
+    """Send `POST /alarms` with retries, hedging and a total deadline.
+
+    Failures where the alarm was not created are retried with jittered
+    exponential backoff until the deadline expires, waiting at least as
+    long as the server's `Retry-After`: a connection that could not be
+    opened, and 408, 429 and 5xx responses. A timeout or dropped
+    connection after the request went out is not retried, since the
+    server may have created the alarm. Every attempt of one alarm carries
+    the same `Idempotency-Key` header, and the outbox intent id is used
+    as the key across restarts, but this is best-effort: the API is not
+    known to de-duplicate on it. For the same reason hedging is off by
+    default; when enabled and a hedged attempt also creates an alarm, the
+    extra alarm is handed to `on_duplicate` so it can be canceled.
+    """
+
+    def __init__(
+        self,
+        client,
+        on_duplicate=None,
+        deadline: float = ALARM_DELIVERY_DEADLINE,
+        attempt_timeout: float = ALARM_ATTEMPT_TIMEOUT,
+        hedge_delay: float | None = ALARM_HEDGE_DELAY,
+    ) -> None:
+        """Initialize the delivery engine."""
+        self._client = client
+        self._on_duplicate = on_duplicate
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.hedge_delay = hedge_delay
+
+    async def async_send(
+        self, body: bytes, idempotency_key: str | None = None
+    ) -> dict:
+        """Deliver the alarm body and return the created alarm."""
+        headers = {
+            **self._client.headers,
+            "Idempotency-Key": idempotency_key or uuid.uuid4().hex,
+        }
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        attempt = 0
+        last_error = None
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise AlarmDeliveryError(
+                    f"Not delivered within {self.deadline}s "
+                    f"after {attempt} attempt(s): {last_error}"
+                )
+            attempt += 1
+            try:
+                return await self._async_attempt(body, headers, remaining)
+            except _RetryableError as e:
+                last_error = e
+                _LOGGER.warning(f"Alarm delivery attempt {attempt} failed: {e}")
+
+            delay = min(ALARM_BACKOFF_BASE * 2 ** (attempt - 1), ALARM_BACKOFF_MAX)
+            delay *= random.uniform(0.5, 1.0)
+            if last_error.retry_after is not None:
+                delay = max(delay, last_error.retry_after)
+            if loop.time() + delay >= deadline:
+                raise AlarmDeliveryError(
+                    f"Not delivered within {self.deadline}s "
+                    f"after {attempt} attempt(s): {last_error}"
+                )
+            self._client.metrics.record_retry("create")
+            await asyncio.sleep(delay)
+
+    async def _async_attempt(self, body, headers, remaining) -> dict:
+        """Run one attempt, hedged with a second request when it is slow."""
+        timeout = min(self.attempt_timeout, remaining)
+        first = asyncio.ensure_future(self._async_post(body, headers, timeout))
+        if self.hedge_delay is None or self.hedge_delay >= timeout:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_delay)
+        if done:
+            return first.result()
+
+        _LOGGER.debug("Alarm delivery is slow, sending a hedged request")
+        second = asyncio.ensure_future(
+            self._async_post(body, headers, timeout - self.hedge_delay)
+        )
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                try:
+                    alarm = task.result()
+                except _RetryableError as e:
+                    error = e
+                    continue
+                except Exception:
+                    for other in pending:
+                        other.cancel()
+                    raise
+                # Both attempts may have completed in the same wakeup
+                for other in (done | pending) - {task}:
+                    self._reap(other, alarm.get("id"))
+                return alarm
+        raise error
+
+    def _reap(self, task, alarm_id) -> None:
+        """Let a losing attempt finish and report it if it created an alarm.
+
+        Canceling the task would not tell us whether the server already
+        accepted the request, so it is left to complete in the background.
+        """
+
+        def _done(task):
+            if task.cancelled() or task.exception() is not None:
+                return
+            duplicate = task.result()
+            if duplicate.get("id") != alarm_id and self._on_duplicate:
+                _LOGGER.warning(
+                    f"Hedged request created duplicate alarm {duplicate.get('id')}"
+                )
+                self._on_duplicate(duplicate)
+
+        task.add_done_callback(_done)
+
+    async def _async_post(self, body, headers, timeout) -> dict:
+        """Make a single `POST /alarms` request."""
+        try:
+            return await self._client.async_create_alarm(body, headers, timeout)
+        except EndpointUnreachable as e:
+            raise _RetryableError(str(e)) from e
+        except NoonlightApiError as e:
+            if e.status is None:
+                raise AlarmDeliveryError(
+                    f"No response, the alarm may have been created: {e}",
+                    retryable=False,
+                ) from e
+            if e.status >= 500 or e.status in (408, 429):
+                raise _RetryableError(str(e), e.retry_after) from e
+            raise AlarmDeliveryError(str(e), retryable=False) from e
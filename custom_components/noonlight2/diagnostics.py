@@ -0,0 +1,109 @@
+"""Diagnostics support for Noonlight."""
+
+import json
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_NAME,
+    CONF_WEBHOOK_ID,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ADDRESS_LINE1,
+    CONF_ADDRESS_LINE2,
+    CONF_CITY,
+    CONF_PHONE_NUMBER,
+    CONF_PIN,
+    CONF_SERVER_TOKEN,
+    CONF_STATE,
+    CONF_USER_NAME,
+    CONF_ZIP,
+    DOMAIN,
+)
+
+TO_REDACT = {
+    CONF_SERVER_TOKEN,
+    CONF_PIN,
+    CONF_PHONE_NUMBER,
+    CONF_USER_NAME,
+    CONF_NAME,
+    CONF_ADDRESS_LINE1,
+    CONF_ADDRESS_LINE2,
+    CONF_CITY,
+    CONF_STATE,
+    CONF_ZIP,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_WEBHOOK_ID,
+    # Keys used in API request bodies
+    "phone",
+    "line1",
+    "line2",
+    "lat",
+    "lng",
+    "owner_id",
+    "Authorization",
+}
+
+
+def _redact_exchange(exchange: dict) -> dict:
+    """Return an exchange summary with its request body redacted."""
+    body = exchange["body"]
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            body = None
+    return {
+        **exchange,
+        "time": exchange["time"].isoformat(),
+        "body": async_redact_data(body, TO_REDACT) if body is not None else None,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    noonlight_integration = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "alarms": {
+            "active": [
+                alarm.as_dict() for alarm in noonlight_integration.alarms.active
+            ],
+            "history": [
+                alarm.as_dict() for alarm in noonlight_integration.alarms.history
+            ],
+        },
+        "countdown": {
+            "remaining": noonlight_integration.countdown.remaining,
+            "services": list(noonlight_integration.countdown.services),
+        },
+        "poller": noonlight_integration.poller.as_dict(
+            noonlight_integration.poll_settings
+        ),
+        "outbox": {
+            "intents": len(noonlight_integration.outbox.intents),
+            "alarms": len(noonlight_integration.outbox.alarms),
+        },
+        "transport": {
+            "connected": noonlight_integration.transport.connected,
+            "endpoints": noonlight_integration.transport.endpoints.as_dict(),
+        },
+        "rate_limit": noonlight_integration.limiter.as_dict(),
+        "tracing": noonlight_integration.tracer.enabled,
+        "metrics": noonlight_integration.metrics.as_dict(),
+        # Redacted here rather than when recorded to keep the API path cheap
+        "exchanges": [
+            _redact_exchange(exchange)
+            for exchange in noonlight_integration.metrics.exchanges
+        ],
+    }
@@ -0,0 +1,186 @@
+"""Health tracking and failover between Noonlight API endpoints."""
+
+import logging
+from collections import deque
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    ENDPOINT_ERROR_PENALTY,
+    ENDPOINT_FAILURE_THRESHOLD,
+    ENDPOINT_OPEN_MAX_DURATION,
+    ENDPOINT_OPEN_MIN_DURATION,
+    ENDPOINT_WINDOW_SIZE,
+)
+from .metrics import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+def parse_endpoints(value: str) -> tuple[str, ...]:
+    """Split a comma-separated endpoint setting into an ordered tuple."""
+    return tuple(
+        endpoint.strip() for endpoint in value.split(",") if endpoint.strip()
+    )
+
+
+class EndpointHealth:
+    """Rolling latency, error rate and circuit state of one endpoint."""
+
+    __slots__ = (
+        "url",
+        "latency",
+        "state",
+        "consecutive_failures",
+        "open_duration",
+        "_outcomes",
+    )
+
+    def __init__(self, url: str) -> None:
+        """Initialize the health record."""
+        self.url = url
+        self.latency = LatencyHistogram(ENDPOINT_WINDOW_SIZE)
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.open_duration = ENDPOINT_OPEN_MIN_DURATION
+        self._outcomes = deque(maxlen=ENDPOINT_WINDOW_SIZE)
+
+    def record(self, seconds: float | None, failed: bool) -> None:
+        """Record the outcome of one request."""
+        if seconds is not None:
+            self.latency.record(seconds)
+        self._outcomes.append(failed)
+        self.consecutive_failures = self.consecutive_failures + 1 if failed else 0
+
+    def reset(self) -> None:
+        """Forget failures from before an outage."""
+        self._outcomes.clear()
+        self.consecutive_failures = 0
+        self.open_duration = ENDPOINT_OPEN_MIN_DURATION
+
+    @property
+    def error_rate(self) -> float:
+        """Return the share of failed requests in the window."""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    @property
+    def score(self) -> float:
+        """Return the expected cost of a request in seconds; lower is better."""
+        return (self.latency.avg or 0.0) + self.error_rate * ENDPOINT_ERROR_PENALTY
+
+    def as_dict(self) -> dict:
+        """Return the health record as a dictionary."""
+        return {
+            "url": self.url,
+            "state": self.state,
+            "latency_avg": self.latency.avg,
+            "error_rate": self.error_rate,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class EndpointPool:
+    """Rank the configured endpoints and stop using broken ones.
+
+    Every request outcome is recorded per endpoint. Requests go to the
+    endpoint with the lowest rolling latency plus error penalty, in
+    configured order while there is no data. After
+    `ENDPOINT_FAILURE_THRESHOLD` failures in a row the endpoint's circuit
+    opens and it is skipped without a request. Once the open period has
+    passed, `async_probe` checks it in the background; the circuit closes
+    if the probe succeeds and reopens for twice as long if it fails. When
+    every endpoint is open they are still tried in order, so an alarm is
+    never refused without a request.
+    """
+
+    def __init__(self, hass: HomeAssistant, endpoints, async_probe) -> None:
+        """Initialize the pool."""
+        self.hass = hass
+        self._async_probe = async_probe
+        self.endpoints = {url: EndpointHealth(url) for url in endpoints}
+        self._cancel_probes = {}
+        self._stopped = False
+
+    def ranked(self) -> list[str]:
+        """Return the endpoints to try, best first."""
+        closed = [
+            health
+            for health in self.endpoints.values()
+            if health.state == CIRCUIT_CLOSED
+        ]
+        if not closed:
+            return list(self.endpoints)
+        return [health.url for health in sorted(closed, key=lambda h: h.score)]
+
+    @callback
+    def record_success(self, url: str, seconds: float | None = None) -> None:
+        """Record a response from the endpoint."""
+        health = self.endpoints[url]
+        health.record(seconds, failed=False)
+        if health.state != CIRCUIT_CLOSED:
+            self._close(health)
+
+    @callback
+    def record_failure(self, url: str, seconds: float | None = None) -> None:
+        """Record a request that got no usable response from the endpoint."""
+        health = self.endpoints[url]
+        health.record(seconds, failed=True)
+        if (
+            health.state == CIRCUIT_CLOSED
+            and health.consecutive_failures >= ENDPOINT_FAILURE_THRESHOLD
+        ):
+            self._open(health)
+
+    @callback
+    def stop(self) -> None:
+        """Cancel the scheduled probes."""
+        self._stopped = True
+        for cancel in self._cancel_probes.values():
+            cancel()
+        self._cancel_probes.clear()
+
+    @callback
+    def _close(self, health: EndpointHealth) -> None:
+        _LOGGER.info(f"Noonlight endpoint {health.url} recovered")
+        health.state = CIRCUIT_CLOSED
+        health.reset()
+        if (cancel := self._cancel_probes.pop(health.url, None)) is not None:
+            cancel()
+
+    @callback
+    def _open(self, health: EndpointHealth) -> None:
+        _LOGGER.warning(
+            f"Noonlight endpoint {health.url} failed "
+            f"{health.consecutive_failures} times, "
+            f"skipping it for {health.open_duration}s"
+        )
+        health.state = CIRCUIT_OPEN
+
+        async def _async_half_open(now):
+            self._cancel_probes.pop(health.url, None)
+            health.state = CIRCUIT_HALF_OPEN
+            if await self._async_probe(health.url):
+                self.record_success(health.url)
+                return
+            # A request may have closed the circuit while the probe ran
+            if self._stopped or health.state != CIRCUIT_HALF_OPEN:
+                return
+            health.open_duration = min(
+                health.open_duration * 2, ENDPOINT_OPEN_MAX_DURATION
+            )
+            self._open(health)
+
+        self._cancel_probes[health.url] = async_call_later(
+            self.hass, health.open_duration, _async_half_open
+        )
+
+    def as_dict(self) -> list[dict]:
+        """Return the health of every endpoint, in configured order."""
+        return [health.as_dict() for health in self.endpoints.values()]
@@ -0,0 +1,154 @@
+"""Forward entity state changes to Noonlight while an alarm is active."""
+
+import logging
+
+from homeassistant.const import ATTR_DEVICE_CLASS, ATTR_FRIENDLY_NAME
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+
+from .const import EVENT_COALESCE_WINDOW, EVENT_MAX_IN_FLIGHT
+
+_LOGGER = logging.getLogger(__name__)
+
+# device_class -> (Noonlight attribute, value when on, value when off)
+DEVICE_CLASS_ATTRIBUTES = {
+    "door": ("contact", "open", "closed"),
+    "garage_door": ("contact", "open", "closed"),
+    "opening": ("contact", "open", "closed"),
+    "window": ("contact", "open", "closed"),
+    "motion": ("motion", "detected", "cleared"),
+    "occupancy": ("motion", "detected", "cleared"),
+    "presence": ("motion", "detected", "cleared"),
+    "smoke": ("smoke", "detected", "clear"),
+    "gas": ("smoke", "detected", "clear"),
+    "carbon_monoxide": ("co", "detected", "clear"),
+    "moisture": ("water_leak", "detected", "clear"),
+}
+
+
+def state_to_event(state: State) -> dict | None:
+    """Build a Noonlight alarm event from an entity state."""
+    if state.state in ("unavailable", "unknown"):
+        return None
+
+    device_class = state.attributes.get(ATTR_DEVICE_CLASS)
+    if device_class in DEVICE_CLASS_ATTRIBUTES:
+        attribute, on_value, off_value = DEVICE_CLASS_ATTRIBUTES[device_class]
+        value = on_value if state.state == "on" else off_value
+    elif state.domain == "lock":
+        attribute, value = "lock", state.state
+    else:
+        attribute, value = device_class or state.domain, state.state
+
+    return {
+        "event_type": "alarm.device.value_changed",
+        "event_time": state.last_changed.isoformat(timespec="milliseconds"),
+        "meta": {
+            "attribute": attribute,
+            "value": value,
+            "device_id": state.entity_id,
+            "device_name": state.attributes.get(ATTR_FRIENDLY_NAME, state.entity_id),
+            "device_manufacturer": "Home Assistant",
+            "device_model": state.domain,
+        },
+    }
+
+
+class AlarmEventForwarder:
+    """Batch state changes of selected entities into alarm events.
+
+    Changes are collected for a short coalescing window and only the
+    latest change of each entity is kept. A change back to the value last
+    sent to Noonlight is dropped, so a flapping sensor produces at most
+    one event per window. At most `EVENT_MAX_IN_FLIGHT` submissions are
+    in flight at once; changes arriving meanwhile wait for the next batch.
+    """
+
+    def __init__(self, hass: HomeAssistant, async_send, entity_ids: list[str]) -> None:
+        """Initialize the forwarder."""
+        self.hass = hass
+        self._async_send = async_send
+        self.entity_ids = entity_ids
+        self.alarm_id = None
+        self._last_sent: dict[str, str] = {}
+        self._pending: dict[str, dict] = {}
+        self._in_flight = 0
+        self._unsub_state = None
+        self._cancel_flush = None
+
+    @callback
+    def start(self, alarm_id: str) -> None:
+        """Forward state changes to the given alarm."""
+        if not self.entity_ids:
+            return
+        if self.alarm_id != alarm_id:
+            self._last_sent.clear()
+            self._pending.clear()
+        self.alarm_id = alarm_id
+        if self._unsub_state is None:
+            self._unsub_state = async_track_state_change_event(
+                self.hass, self.entity_ids, self._async_state_changed
+            )
+
+    @callback
+    def stop(self) -> None:
+        """Stop forwarding."""
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        self._pending.clear()
+        self.alarm_id = None
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Queue a state change for the next batch."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        alarm_event = state_to_event(new_state)
+        if alarm_event is None:
+            return
+
+        entity_id = new_state.entity_id
+        if self._last_sent.get(entity_id) == alarm_event["meta"]["value"]:
+            self._pending.pop(entity_id, None)
+            return
+        self._pending[entity_id] = alarm_event
+        if self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, EVENT_COALESCE_WINDOW, self._async_flush
+            )
+
+    async def _async_flush(self, now=None) -> None:
+        """Submit the pending batch, unless too many are in flight."""
+        self._cancel_flush = None
+        if not self._pending or self.alarm_id is None:
+            return
+        if self._in_flight >= EVENT_MAX_IN_FLIGHT:
+            return
+
+        batch = self._pending
+        self._pending = {}
+        for entity_id, alarm_event in batch.items():
+            self._last_sent[entity_id] = alarm_event["meta"]["value"]
+
+        self._in_flight += 1
+        try:
+            await self._async_send(self.alarm_id, list(batch.values()))
+        except Exception as e:
+            _LOGGER.error(f"Failed to send alarm events: {e}")
+            for entity_id in batch:
+                self._last_sent.pop(entity_id, None)
+        finally:
+            self._in_flight -= 1
+
+        if self._pending and self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, EVENT_COALESCE_WINDOW, self._async_flush
+            )
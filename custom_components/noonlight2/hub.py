@@ -0,0 +1,56 @@
+"""Resources shared by all Noonlight config entries."""
+
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from .poller import AlarmStatusPoller
+from .transport import NoonlightTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NoonlightHub:
+    """Share one status poller and one transport per API endpoint list.
+
+    Monitoring several sites from one Home Assistant instance then adds
+    neither timers nor connection pools per site. Transports are
+    reference counted and closed when the last entry using them is
+    unloaded. An entry with tracing enabled gets a transport of its own,
+    so trace hooks are only installed on the traced entry's requests.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.poller = AlarmStatusPoller(hass)
+        self._transports: dict[tuple[str, ...], NoonlightTransport] = {}
+        self._users: dict[NoonlightTransport, int] = {}
+
+    def acquire_transport(
+        self, api_endpoints: tuple[str, ...], trace_configs=None
+    ) -> NoonlightTransport:
+        """Return a transport for the endpoints and count the new user."""
+        if trace_configs:
+            transport = NoonlightTransport(self.hass, api_endpoints, trace_configs)
+        else:
+            transport = self._transports.get(api_endpoints)
+            if transport is None:
+                transport = NoonlightTransport(self.hass, api_endpoints)
+                self._transports[api_endpoints] = transport
+        self._users[transport] = self._users.get(transport, 0) + 1
+        _LOGGER.debug(
+            f"[hub] transport for {', '.join(api_endpoints)} "
+            f"has {self._users[transport]} user(s)"
+        )
+        return transport
+
+    async def async_release_transport(self, transport: NoonlightTransport) -> None:
+        """Drop one user of the transport and close it after the last one."""
+        users = self._users.pop(transport, 1) - 1
+        if users > 0:
+            self._users[transport] = users
+            return
+        if self._transports.get(transport.api_endpoints) is transport:
+            del self._transports[transport.api_endpoints]
+        await transport.async_stop()
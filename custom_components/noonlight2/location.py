@@ -0,0 +1,149 @@
+"""Stream the location of a tracked entity to an active Noonlight alarm."""
+
+import logging
+
+from homeassistant.const import ATTR_GPS_ACCURACY, ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from homeassistant.util.location import distance
+
+from .const import (
+    LOCATION_DEFAULT_ACCURACY,
+    LOCATION_MIN_DISTANCE,
+    LOCATION_MIN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def state_coordinates(state: State | None) -> dict | None:
+    """Return Noonlight coordinates from a device_tracker/person state."""
+    if state is None:
+        return None
+    latitude = state.attributes.get(ATTR_LATITUDE)
+    longitude = state.attributes.get(ATTR_LONGITUDE)
+    if latitude is None or longitude is None:
+        return None
+    return {
+        "lat": latitude,
+        "lng": longitude,
+        "accuracy": state.attributes.get(ATTR_GPS_ACCURACY)
+        or LOCATION_DEFAULT_ACCURACY,
+    }
+
+
+class LocationUpdater:
+    """Send location updates for an alarm as the tracked entity moves.
+
+    An update is sent only when the entity moved at least
+    `LOCATION_MIN_DISTANCE` meters from the last reported position, and
+    at most once every `LOCATION_MIN_INTERVAL` seconds. A move inside the
+    interval is sent when the interval ends, using the latest position.
+    """
+
+    def __init__(self, hass: HomeAssistant, async_send, entity_id: str | None) -> None:
+        """Initialize the updater."""
+        self.hass = hass
+        self._async_send = async_send
+        self.entity_id = entity_id
+        self.alarm_id = None
+        self.update_count = 0
+        self._last_sent: dict | None = None
+        self._last_sent_at = 0.0
+        self._pending: dict | None = None
+        self._sending = False
+        self._unsub_state = None
+        self._cancel_send = None
+
+    @callback
+    def current_coordinates(self) -> dict | None:
+        """Return the tracked entity's current coordinates."""
+        if self.entity_id is None:
+            return None
+        return state_coordinates(self.hass.states.get(self.entity_id))
+
+    @callback
+    def start(self, alarm_id: str, coordinates: dict | None = None) -> None:
+        """Stream location changes to the given alarm.
+
+        `coordinates` is the position the alarm was created with.
+        """
+        if self.entity_id is None:
+            return
+        if self.alarm_id != alarm_id:
+            self._last_sent = coordinates
+            self._last_sent_at = self.hass.loop.time()
+            self._pending = None
+        self.alarm_id = alarm_id
+        if self._unsub_state is None:
+            self._unsub_state = async_track_state_change_event(
+                self.hass, [self.entity_id], self._async_state_changed
+            )
+
+    @callback
+    def stop(self) -> None:
+        """Stop streaming."""
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._cancel_send is not None:
+            self._cancel_send()
+            self._cancel_send = None
+        self._pending = None
+        self.alarm_id = None
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Queue a position change if it moved far enough."""
+        coordinates = state_coordinates(event.data.get("new_state"))
+        if coordinates is None:
+            return
+        if self._last_sent is not None and (
+            distance(
+                self._last_sent["lat"],
+                self._last_sent["lng"],
+                coordinates["lat"],
+                coordinates["lng"],
+            )
+            < LOCATION_MIN_DISTANCE
+        ):
+            self._pending = None
+            return
+
+        self._pending = coordinates
+        if self._cancel_send is None and not self._sending:
+            delay = max(
+                self._last_sent_at + LOCATION_MIN_INTERVAL - self.hass.loop.time(), 0
+            )
+            self._cancel_send = async_call_later(
+                self.hass, delay, self._async_send_pending
+            )
+
+    async def _async_send_pending(self, now=None) -> None:
+        """Send the latest pending position."""
+        self._cancel_send = None
+        if self._pending is None or self.alarm_id is None:
+            return
+
+        coordinates = self._pending
+        self._pending = None
+        self._sending = True
+        self._last_sent_at = self.hass.loop.time()
+        try:
+            await self._async_send(self.alarm_id, coordinates)
+            self._last_sent = coordinates
+            self.update_count += 1
+        except Exception as e:
+            _LOGGER.error(f"Failed to update alarm location: {e}")
+            if self._pending is None:
+                self._pending = coordinates
+        finally:
+            self._sending = False
+
+        if self._pending is not None and self.alarm_id is not None:
+            self._cancel_send = async_call_later(
+                self.hass, LOCATION_MIN_INTERVAL, self._async_send_pending
+            )
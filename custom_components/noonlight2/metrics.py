@@ -0,0 +1,201 @@
+"""In-memory latency and error metrics for Noonlight API calls."""
+
+from collections import Counter, deque
+from collections.abc import Callable
+
+import homeassistant.util.dt as dt_util
+
+from .const import EXCHANGE_LOG_SIZE, METRICS_WINDOW_SIZE
+
+
+class LatencyHistogram:
+    """Latencies of the last `size` requests, in seconds.
+
+    Recording is an append to a fixed-size deque; percentiles are only
+    computed when read.
+    """
+
+    __slots__ = ("_samples", "last")
+
+    def __init__(self, size: int = METRICS_WINDOW_SIZE) -> None:
+        """Initialize the histogram."""
+        self._samples = deque(maxlen=size)
+        self.last = None
+
+    def record(self, seconds: float) -> None:
+        """Record one latency."""
+        self._samples.append(seconds)
+        self.last = seconds
+
+    @property
+    def avg(self) -> float | None:
+        """Return the average latency of the window."""
+        if not self._samples:
+            return None
+        return sum(self._samples) / len(self._samples)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a latency percentile of the window."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(round(percent / 100 * (len(ordered) - 1)), len(ordered) - 1)
+        return ordered[index]
+
+
+class OperationMetrics:
+    """Counters and latencies of one kind of API call."""
+
+    __slots__ = (
+        "latency",
+        "requests",
+        "errors",
+        "timeouts",
+        "retries",
+        "status_codes",
+        "_outcomes",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.status_codes = Counter()
+        self._outcomes = deque(maxlen=METRICS_WINDOW_SIZE)
+
+    def record(self, seconds, status, failed, timed_out) -> None:
+        """Record the outcome of one request."""
+        self.requests += 1
+        self.latency.record(seconds)
+        if status is not None:
+            self.status_codes[status] += 1
+        if failed:
+            self.errors += 1
+        if timed_out:
+            self.timeouts += 1
+        self._outcomes.append(failed)
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the share of failed requests in the window."""
+        if not self._outcomes:
+            return None
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def as_dict(self) -> dict:
+        """Return a summary of the metrics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "error_rate": self.error_rate,
+            "status_codes": dict(self.status_codes),
+            "latency_last": self.latency.last,
+            "latency_avg": self.latency.avg,
+            "latency_p95": self.latency.percentile(95),
+        }
+
+
+class _Measurement:
+    """Context manager timing one API call."""
+
+    __slots__ = ("_metrics", "_operation", "_start", "_exchange", "status")
+
+    def __init__(self, metrics, operation: str, exchange: dict | None) -> None:
+        self._metrics = metrics
+        self._operation = operation
+        self._start = 0.0
+        self._exchange = exchange
+        self.status = None
+
+    def __enter__(self):
+        self._start = self._metrics.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = self._metrics.clock() - self._start
+        self._metrics.record(self._operation, seconds, status=self.status, error=exc)
+        if self._exchange is not None:
+            self._exchange.update(
+                operation=self._operation,
+                time=dt_util.utcnow(),
+                status=self.status,
+                latency=seconds,
+                error=None if exc is None else f"{type(exc).__name__}: {exc}",
+            )
+            self._metrics.exchanges.append(self._exchange)
+        return False
+
+
+class NoonlightMetrics:
+    """Metrics of every API call made by the integration.
+
+    Calls are wrapped with `measure()`. A call counts as successful when
+    it raised nothing and, if a status was set, the status is below 400.
+    Listeners added with `subscribe()` are called after each recorded
+    call of their operation.
+    Calls measured with a `path` are also kept in a ring buffer of the
+    last `EXCHANGE_LOG_SIZE` exchanges. Request bodies are stored as sent
+    and only redacted when the buffer is read for diagnostics.
+    """
+
+    def __init__(self, clock) -> None:
+        """Initialize the metrics; `clock` returns monotonic seconds."""
+        self.clock = clock
+        self.operations: dict[str, OperationMetrics] = {}
+        self.exchanges = deque(maxlen=EXCHANGE_LOG_SIZE)
+        self.last_contact = None
+        self._listeners: dict[str, list] = {}
+
+    def operation(self, name: str) -> OperationMetrics:
+        """Return the metrics of an operation."""
+        metrics = self.operations.get(name)
+        if metrics is None:
+            metrics = self.operations[name] = OperationMetrics()
+        return metrics
+
+    def measure(
+        self, name: str, path: str | None = None, alarm_id=None, body=None
+    ) -> _Measurement:
+        """Time an API call: `with metrics.measure("status") as m: ...`."""
+        exchange = None
+        if path is not None:
+            exchange = {"endpoint": path, "alarm_id": alarm_id, "body": body}
+        return _Measurement(self, name, exchange)
+
+    def subscribe(self, name: str, listener) -> Callable[[], None]:
+        """Call `listener` after each recorded call of an operation.
+
+        Return a function that unsubscribes it.
+        """
+        listeners = self._listeners.setdefault(name, [])
+        listeners.append(listener)
+        return lambda: listeners.remove(listener)
+
+    def record(self, name, seconds, status=None, error=None) -> None:
+        """Record the outcome of one API call."""
+        failed = error is not None or (status is not None and status >= 400)
+        self.operation(name).record(
+            seconds, status, failed, isinstance(error, TimeoutError)
+        )
+        if status is not None and not failed:
+            self.last_contact = dt_util.utcnow()
+        for listener in self._listeners.get(name, ()):
+            listener()
+
+    def record_retry(self, name: str) -> None:
+        """Count a retried API call."""
+        self.operation(name).retries += 1
+
+    def as_dict(self) -> dict:
+        """Return a summary of all metrics."""
+        return {
+            "last_contact": self.last_contact,
+            "operations": {
+                name: metrics.as_dict() for name, metrics in self.operations.items()
+            },
+        }
@@ -0,0 +1,83 @@
+"""Alarm model for the Noonlight integration."""
+
+from datetime import datetime
+
+import homeassistant.util.dt as dt_util
+
+
+class NoonlightAlarm:
+    """An alarm created by one config entry.
+
+    Only the fields the integration uses are kept, so extra fields in API
+    responses do not accumulate in memory. `apply()` takes a response or
+    callback payload and reports whether anything changed, so entity
+    state is only written on real transitions. `instructions` holds the
+    instructions already sent for the alarm, so they are not sent again.
+    """
+
+    __slots__ = (
+        "id",
+        "entry_id",
+        "status",
+        "services",
+        "instructions",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        alarm_id: str,
+        entry_id: str | None = None,
+        status: str | None = None,
+        services: dict | None = None,
+        created_at: datetime | None = None,
+    ) -> None:
+        """Initialize the alarm."""
+        self.id = alarm_id
+        self.entry_id = entry_id
+        self.status = status
+        self.services = services or {}
+        self.instructions: set[str] = set()
+        self.created_at = created_at or dt_util.utcnow()
+        self.updated_at = self.created_at
+
+    @classmethod
+    def from_api(cls, data: dict, entry_id: str | None = None) -> "NoonlightAlarm":
+        """Create an alarm from a `POST /alarms` response."""
+        created_at = data.get("created_at")
+        if isinstance(created_at, str):
+            created_at = dt_util.parse_datetime(created_at)
+        return cls(
+            data["id"],
+            entry_id,
+            data.get("status"),
+            dict(data.get("services") or {}),
+            created_at,
+        )
+
+    def apply(self, data: dict) -> bool:
+        """Apply the status and services in `data`; return whether they changed."""
+        changed = False
+        status = data.get("status")
+        if status is not None and status != self.status:
+            self.status = status
+            changed = True
+        services = data.get("services")
+        if services is not None and services != self.services:
+            self.services = dict(services)
+            changed = True
+        if changed:
+            self.updated_at = dt_util.utcnow()
+        return changed
+
+    def as_dict(self) -> dict:
+        """Return the alarm as a dictionary."""
+        return {
+            "id": self.id,
+            "entry_id": self.entry_id,
+            "status": self.status,
+            "services": self.services,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
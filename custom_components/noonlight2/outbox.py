@@ -0,0 +1,122 @@
+"""Durable outbox of alarm intents and active alarms."""
+
+import logging
+import uuid
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    OUTBOX_INTENT_DEADLINE,
+    OUTBOX_SAVE_DELAY,
+    OUTBOX_STORAGE_VERSION,
+)
+from .models import NoonlightAlarm
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AlarmOutbox:
+    """Persist alarm intents and active alarm ids across restarts.
+
+    An intent is recorded before an alarm is sent and removed once
+    Noonlight returns the created alarm, so unsent alarms can be retried
+    after a network outage or a restart. An intent is discarded instead
+    when a request timed out after it was sent, since the alarm may have
+    been created. The intent id is sent
+    as the `Idempotency-Key` of every attempt as a best-effort guard
+    against duplicates. Active alarms are recorded so status tracking
+    resumes after a restart. Saves are delayed and
+    coalesced so the store never sits on the send path.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the outbox."""
+        self._store = Store(
+            hass, OUTBOX_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.outbox"
+        )
+        self.intents: dict[str, dict] = {}
+        self.alarms: dict[str, dict] = {}
+
+    async def async_load(self) -> None:
+        """Load the outbox from storage."""
+        data = await self._store.async_load() or {}
+        self.intents = data.get("intents", {})
+        self.alarms = data.get("alarms", {})
+        _LOGGER.debug(
+            f"[outbox] loaded {len(self.intents)} intent(s), "
+            f"{len(self.alarms)} active alarm(s)"
+        )
+
+    async def async_flush(self) -> None:
+        """Write pending changes immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored outbox."""
+        await self._store.async_remove()
+
+    @callback
+    def add_intent(self, services: dict, instruction: str | None) -> str:
+        """Record an alarm that is about to be sent and return its id."""
+        intent_id = uuid.uuid4().hex
+        now = dt_util.utcnow().timestamp()
+        self.intents[intent_id] = {
+            "services": services,
+            "instruction": instruction,
+            "created": now,
+            "deadline": now + OUTBOX_INTENT_DEADLINE.total_seconds(),
+        }
+        self._schedule_save()
+        return intent_id
+
+    @callback
+    def pending_intents(self) -> list[tuple[str, dict]]:
+        """Return unsent intents, dropping the ones past their deadline."""
+        now = dt_util.utcnow().timestamp()
+        pending = []
+        for intent_id, intent in list(self.intents.items()):
+            if intent["deadline"] <= now:
+                _LOGGER.error(
+                    f"Giving up on alarm requested at "
+                    f"{dt_util.utc_from_timestamp(intent['created'])}: "
+                    "not delivered before its deadline"
+                )
+                self.discard_intent(intent_id)
+                continue
+            pending.append((intent_id, intent))
+        return pending
+
+    @callback
+    def discard_intent(self, intent_id: str) -> None:
+        """Forget an intent without an alarm."""
+        if self.intents.pop(intent_id, None) is not None:
+            self._schedule_save()
+
+    @callback
+    def complete_intent(self, intent_id: str, alarm: NoonlightAlarm) -> None:
+        """Mark an intent as delivered and record its alarm as active."""
+        self.intents.pop(intent_id, None)
+        self.alarms[alarm.id] = {
+            "services": alarm.services,
+            "created": alarm.created_at.timestamp(),
+        }
+        self._schedule_save()
+
+    @callback
+    def remove_alarm(self, alarm_id: str) -> None:
+        """Forget an alarm that is no longer active."""
+        if self.alarms.pop(alarm_id, None) is not None:
+            self._schedule_save()
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Save the outbox soon, coalescing with other changes."""
+        self._store.async_delay_save(self._data_to_save, OUTBOX_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the data to store."""
+        return {"intents": self.intents, "alarms": self.alarms}
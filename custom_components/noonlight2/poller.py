@@ -0,0 +1,276 @@
+"""Adaptive alarm status polling for Noonlight."""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    ALARM_POLL_COALESCE_WINDOW,
+    ALARM_POLL_CONCURRENCY,
+    ALARM_POLL_ERROR_BACKOFF_MAX,
+    ALARM_POLL_MAX_INTERVAL,
+    ALARM_POLL_SCHEDULE,
+    CONST_ALARM_TERMINAL_STATUSES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatusPollError(Exception):
+    """A status poll failed; `retry_after` is the server hint in seconds."""
+
+    def __init__(self, message, retry_after: float | None = None) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AlarmPollSettings:
+    """How the alarms of one config entry are polled.
+
+    `async_poll` fetches and applies an alarm status and returns it.
+    `on_expired` is called with the id of an alarm that was polled for
+    longer than `max_lifetime`. When set, `min_interval` is a floor for
+    the poll interval. It only applies once `push_confirmed` is set, i.e.
+    status callbacks are known to arrive; until then alarms are polled on
+    the normal schedule.
+    """
+
+    __slots__ = (
+        "async_poll",
+        "max_lifetime",
+        "min_interval",
+        "on_expired",
+        "push_confirmed",
+    )
+
+    def __init__(
+        self,
+        async_poll,
+        max_lifetime: timedelta,
+        min_interval: timedelta | None = None,
+        on_expired=None,
+    ) -> None:
+        """Initialize the settings."""
+        self.async_poll = async_poll
+        self.max_lifetime = max_lifetime
+        self.min_interval = min_interval
+        self.on_expired = on_expired
+        self.push_confirmed = False
+
+
+class _AlarmTrack:
+    """Polling state of one alarm."""
+
+    __slots__ = (
+        "alarm_id",
+        "settings",
+        "started",
+        "due",
+        "poll_count",
+        "error_count",
+    )
+
+    def __init__(
+        self, alarm_id: str, settings: AlarmPollSettings, started: float
+    ) -> None:
+        """Initialize the track."""
+        self.alarm_id = alarm_id
+        self.settings = settings
+        self.started = started
+        self.due = started
+        self.poll_count = 0
+        self.error_count = 0
+
+
+class AlarmStatusPoller:
+    """Poll the status of all tracked alarms from one shared timer.
+
+    Each alarm is polled on a schedule that adapts to its age: fast right
+    after creation, slower as it ages. Failed polls back off
+    exponentially, honoring `Retry-After`. An alarm stops being polled on
+    any terminal status or once it is older than the `max_lifetime` of
+    its settings, in which case their `on_expired` is called with its id.
+
+    Alarms that are due within the coalescing window are polled together
+    in one tick with bounded concurrency, so the number of timers does
+    not grow with the number of alarms. One poller is shared by all
+    config entries; each entry tracks its alarms with its own settings.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, concurrency: int = ALARM_POLL_CONCURRENCY
+    ) -> None:
+        """Initialize the poller."""
+        self.hass = hass
+        self.interval = 0.0
+        self.poll_count = 0
+        self.tick_count = 0
+        self._tracks: dict[str, _AlarmTrack] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cancel = None
+        self._next_tick = None
+        self._ticking = False
+
+    @property
+    def active(self) -> bool:
+        """Return whether any alarm is being polled."""
+        return bool(self._tracks)
+
+    def as_dict(self, settings: AlarmPollSettings | None = None) -> dict:
+        """Return the scheduler state, with the alarms of `settings` only."""
+        now = self.hass.loop.time()
+        return {
+            "active": self.active,
+            "interval": self.interval,
+            "poll_count": self.poll_count,
+            "tick_count": self.tick_count,
+            "alarms": {
+                track.alarm_id: {
+                    "age": round(now - track.started),
+                    "next_poll_in": round(max(track.due - now, 0), 1),
+                    "poll_count": track.poll_count,
+                    "error_count": track.error_count,
+                }
+                for track in self._tracks.values()
+                if settings is None or track.settings is settings
+            },
+        }
+
+    @callback
+    def track(
+        self, alarm_id: str, settings: AlarmPollSettings, age: float = 0
+    ) -> None:
+        """Start polling an alarm that is `age` seconds old."""
+        now = self.hass.loop.time()
+        track = _AlarmTrack(alarm_id, settings, now - age)
+        track.due = now + self._interval_for_age(settings, age)
+        self._tracks[alarm_id] = track
+        self._reschedule()
+
+    @callback
+    def untrack(self, alarm_id: str) -> None:
+        """Stop polling an alarm."""
+        if self._tracks.pop(alarm_id, None) is not None:
+            self._reschedule()
+
+    @callback
+    def untrack_all(self, settings: AlarmPollSettings) -> None:
+        """Stop polling every alarm tracked with `settings`."""
+        for alarm_id in [
+            track.alarm_id
+            for track in self._tracks.values()
+            if track.settings is settings
+        ]:
+            del self._tracks[alarm_id]
+        self._reschedule()
+
+    @callback
+    def stop(self) -> None:
+        """Stop polling all alarms."""
+        self._tracks.clear()
+        self._cancel_tick()
+
+    def _interval_for_age(self, settings: AlarmPollSettings, age: float) -> float:
+        """Return the poll interval for an alarm of the given age."""
+        interval = ALARM_POLL_MAX_INTERVAL
+        for max_age, step in ALARM_POLL_SCHEDULE:
+            if age < max_age.total_seconds():
+                interval = step
+                break
+        if settings.min_interval is not None and settings.push_confirmed:
+            interval = max(interval, settings.min_interval.total_seconds())
+        return interval
+
+    @callback
+    def _cancel_tick(self) -> None:
+        """Cancel the scheduled tick."""
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+        self._next_tick = None
+
+    @callback
+    def _reschedule(self) -> None:
+        """Schedule the shared tick for the earliest due alarm."""
+        if self._ticking:
+            return
+        if not self._tracks:
+            self._cancel_tick()
+            return
+
+        due = min(track.due for track in self._tracks.values())
+        if self._next_tick is not None and self._next_tick <= due:
+            return
+        self._cancel_tick()
+        delay = max(due - self.hass.loop.time(), 0)
+        self.interval = delay
+        self._next_tick = due
+        _LOGGER.debug(
+            f"[poller] alarms: {len(self._tracks)}, polls: {self.poll_count}, "
+            f"next in {delay:.0f}s"
+        )
+        self._cancel = async_call_later(self.hass, delay, self._async_tick)
+
+    async def _async_tick(self, now) -> None:
+        """Poll every alarm that is due and schedule the next tick."""
+        self._cancel = None
+        self._next_tick = None
+        self._ticking = True
+        self.tick_count += 1
+        try:
+            horizon = self.hass.loop.time() + ALARM_POLL_COALESCE_WINDOW
+            due = [track for track in self._tracks.values() if track.due <= horizon]
+            await asyncio.gather(*(self._async_poll_track(track) for track in due))
+        finally:
+            self._ticking = False
+            self._reschedule()
+
+    async def _async_poll_track(self, track: _AlarmTrack) -> None:
+        """Poll one alarm and compute its next due time."""
+        settings = track.settings
+        age = self.hass.loop.time() - track.started
+        if age >= settings.max_lifetime.total_seconds():
+            _LOGGER.warning(
+                f"Stopped polling alarm {track.alarm_id} after {settings.max_lifetime}"
+            )
+            self._tracks.pop(track.alarm_id, None)
+            if settings.on_expired is not None:
+                settings.on_expired(track.alarm_id)
+            return
+
+        async with self._semaphore:
+            track.poll_count += 1
+            self.poll_count += 1
+            try:
+                status = await settings.async_poll(track.alarm_id)
+            except Exception as e:
+                # Any failure must move the due time forward, or the next
+                # tick would poll the alarm again immediately
+                track.error_count += 1
+                delay = min(
+                    self._interval_for_age(settings, age) * 2**track.error_count,
+                    ALARM_POLL_ERROR_BACKOFF_MAX,
+                )
+                if isinstance(e, StatusPollError) and e.retry_after is not None:
+                    delay = max(delay, e.retry_after)
+                _LOGGER.error(
+                    f"Failed to update status of alarm {track.alarm_id}: {e} "
+                    f"(retrying in {delay:.0f}s)",
+                    exc_info=not isinstance(e, StatusPollError),
+                )
+                track.due = self.hass.loop.time() + delay
+                return
+
+        track.error_count = 0
+        if status in CONST_ALARM_TERMINAL_STATUSES:
+            _LOGGER.debug(
+                f"Alarm {track.alarm_id} reached terminal status {status}, "
+                "polling stopped"
+            )
+            self._tracks.pop(track.alarm_id, None)
+            return
+        track.due = self.hass.loop.time() + self._interval_for_age(settings, age)
@@ -0,0 +1,121 @@
+"""Priority token bucket for outbound Noonlight API requests."""
+
+import asyncio
+import logging
+
+from .const import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_WAIT,
+    RATE_LIMIT_MIN_RATE,
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_RECOVERY,
+    RATE_LIMIT_RESERVE,
+    RATE_LIMIT_THROTTLE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Request priorities, most urgent first
+PRIORITY_ALARM = 0
+PRIORITY_STATUS = 1
+PRIORITY_TELEMETRY = 2
+
+
+class RateLimitExceeded(Exception):
+    """A deferrable request would wait longer than `RATE_LIMIT_MAX_WAIT`."""
+
+    def __init__(self, retry_after: float) -> None:
+        """Initialize the error."""
+        super().__init__(f"Rate limited, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """Token bucket shared by all requests made with one server token.
+
+    Alarm requests never wait: they take a token, even into debt, so they
+    always go out first and deferrable traffic yields to them. Status
+    requests need `RATE_LIMIT_RESERVE` spare tokens in the bucket and
+    telemetry twice as many, so the lower the priority the sooner it
+    backs off. A 429 response pauses deferrable traffic for the server's
+    `Retry-After` and halves the rate, which then recovers a little with
+    each successful request.
+    """
+
+    def __init__(
+        self,
+        time,
+        rate: float = RATE_LIMIT_RATE,
+        burst: float = RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize the limiter; `time` returns monotonic seconds."""
+        self._time = time
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time()
+        self.blocked_until = 0.0
+        self.throttled = 0
+
+    def _refill(self) -> float:
+        now = self._time()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        return now
+
+    async def async_acquire(self, priority: int) -> None:
+        """Wait until a request of this priority may be sent.
+
+        Raise `RateLimitExceeded` instead of waiting longer than
+        `RATE_LIMIT_MAX_WAIT`, so the caller can reschedule.
+        """
+        if priority == PRIORITY_ALARM:
+            self._refill()
+            self._tokens = max(self._tokens - 1, -self.burst)
+            return
+
+        needed = 1 + RATE_LIMIT_RESERVE * priority
+        waited = 0.0
+        while True:
+            now = self._refill()
+            if now < self.blocked_until:
+                wait = self.blocked_until - now
+            elif self._tokens >= needed:
+                self._tokens -= 1
+                return
+            else:
+                wait = (needed - self._tokens) / self.rate
+            if waited + wait > RATE_LIMIT_MAX_WAIT:
+                raise RateLimitExceeded(wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def record_success(self) -> None:
+        """Let the rate recover after a request was accepted."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.rate + RATE_LIMIT_RECOVERY, self.max_rate)
+
+    def record_throttled(self, retry_after: float | None) -> None:
+        """Back off after a 429 response."""
+        self.throttled += 1
+        self.rate = max(self.rate / 2, RATE_LIMIT_MIN_RATE)
+        delay = retry_after if retry_after is not None else RATE_LIMIT_THROTTLE_DELAY
+        self.blocked_until = max(self.blocked_until, self._time() + delay)
+        _LOGGER.warning(
+            f"Noonlight API is throttling requests, deferring polls and "
+            f"telemetry for {delay:.1f}s at {self.rate:.2f} requests/s"
+        )
+
+    def as_dict(self) -> dict:
+        """Return the limiter state as a dictionary."""
+        now = self._refill()
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "tokens": self._tokens,
+            "blocked_for": max(self.blocked_until - now, 0.0),
+            "throttled": self.throttled,
+        }
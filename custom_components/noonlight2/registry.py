@@ -0,0 +1,62 @@
+"""Registry of active and recent Noonlight alarms."""
+
+from collections import OrderedDict
+
+from .const import ALARM_HISTORY_SIZE
+from .models import NoonlightAlarm
+
+
+class AlarmRegistry:
+    """Alarms keyed by alarm id.
+
+    Active alarms stay until they finish. Finished alarms are kept in a
+    bounded history so recent alarms can still be inspected.
+    """
+
+    def __init__(self, history_size: int = ALARM_HISTORY_SIZE) -> None:
+        """Initialize the registry."""
+        self._active: OrderedDict[str, NoonlightAlarm] = OrderedDict()
+        self._history: OrderedDict[str, NoonlightAlarm] = OrderedDict()
+        self._history_size = history_size
+
+    @property
+    def current(self) -> NoonlightAlarm | None:
+        """Return the most recently created active alarm."""
+        if not self._active:
+            return None
+        return next(reversed(self._active.values()))
+
+    @property
+    def active(self) -> list[NoonlightAlarm]:
+        """Return all active alarms, oldest first."""
+        return list(self._active.values())
+
+    @property
+    def history(self) -> list[NoonlightAlarm]:
+        """Return finished alarms, oldest first."""
+        return list(self._history.values())
+
+    def get(self, alarm_id: str) -> NoonlightAlarm | None:
+        """Return an active alarm by id."""
+        return self._active.get(alarm_id)
+
+    def add(self, alarm: NoonlightAlarm) -> None:
+        """Register a newly created alarm as active."""
+        self._active[alarm.id] = alarm
+
+    def finish(self, alarm_id: str) -> NoonlightAlarm | None:
+        """Move an alarm from the active set into the history."""
+        alarm = self._active.pop(alarm_id, None)
+        if alarm is not None:
+            self._history[alarm_id] = alarm
+            while len(self._history) > self._history_size:
+                self._history.popitem(last=False)
+        return alarm
+
+    def __len__(self) -> int:
+        """Return the number of active alarms."""
+        return len(self._active)
+
+    def __contains__(self, alarm_id: str) -> bool:
+        """Return whether the alarm is active."""
+        return alarm_id in self._active
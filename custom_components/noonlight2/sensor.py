@@ -0,0 +1,269 @@
+"""Alarm and diagnostic sensors for Noonlight."""
+import logging
+
+import homeassistant.util.dt as dt_util
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, Platform, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+def _create_latency_last(metrics):
+    return metrics.operation("create").latency.last
+
+
+def _create_latency_avg(metrics):
+    return metrics.operation("create").latency.avg
+
+
+def _create_latency_p95(metrics):
+    return metrics.operation("create").latency.percentile(95)
+
+
+def _poll_error_rate(metrics):
+    error_rate = metrics.operation("status").error_rate
+    return None if error_rate is None else round(error_rate * 100, 1)
+
+
+def _alarm_status(data):
+    return "idle" if data["status"] is None else data["status"].lower()
+
+
+def _alarm_age(data):
+    if data["created_at"] is None:
+        return None
+    return int((dt_util.utcnow() - data["created_at"]).total_seconds() // 60)
+
+
+def _last_contact(data):
+    return data["last_contact"]
+
+
+def _countdown(data):
+    return data["countdown"]
+
+
+# key, name, value function returning seconds
+LATENCY_SENSORS = (
+    ("create_latency_last", "Alarm Create Latency", _create_latency_last),
+    ("create_latency_avg", "Alarm Create Latency Average", _create_latency_avg),
+    ("create_latency_p95", "Alarm Create Latency P95", _create_latency_p95),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities,
+) -> None:
+    """Setup the sensor platform with a config_entry (config_flow)."""
+
+    noonlight_integration = hass.data.get(DOMAIN).get(config_entry.entry_id)
+    entities = [
+        NoonlightLatencySensor(noonlight_integration, key, name, value_fn)
+        for key, name, value_fn in LATENCY_SENSORS
+    ]
+    entities.append(NoonlightPollErrorRateSensor(noonlight_integration))
+    entities.append(NoonlightAlarmStatusSensor(noonlight_integration))
+    entities.append(NoonlightAlarmAgeSensor(noonlight_integration))
+    entities.append(NoonlightLastContactSensor(noonlight_integration))
+    entities.append(NoonlightCountdownSensor(noonlight_integration))
+    async_add_entities(entities)
+
+
+class NoonlightDiagnosticSensor(SensorEntity):
+    """Base class for Noonlight sensors fed by the API metrics.
+
+    The value is recomputed after each recorded call of `operation` and
+    the state is only written when it changed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(self, noonlight_integration, key, name, operation, value_fn):
+        """Initialize the sensor."""
+        self.noonlight = noonlight_integration
+        self._operation = operation
+        self._value_fn = value_fn
+        self._refresh = None
+        self._attr_unique_id = (
+            f"{key}_{Platform.SENSOR}_{self.noonlight.config.get('id', '')}"
+        )
+        self._attr_name = f"Noonlight2 {name}"
+        self._attr_device_info = self.noonlight.device_info
+        self._attr_native_value = self._value()
+
+    def _value(self):
+        return self._value_fn(self.noonlight.metrics)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the metrics of the operation."""
+        self.async_on_remove(
+            self.noonlight.metrics.subscribe(
+                self._operation, self._async_metrics_recorded
+            )
+        )
+        self.async_on_remove(self._async_cancel_refresh)
+
+    @callback
+    def _async_metrics_recorded(self):
+        """Refresh once the measured call has returned."""
+        # Keeps the state write off the path of an alarm being created
+        if self._refresh is None:
+            self._refresh = self.hass.loop.call_soon(self._async_refresh)
+
+    @callback
+    def _async_cancel_refresh(self):
+        if self._refresh is not None:
+            self._refresh.cancel()
+            self._refresh = None
+
+    @callback
+    def _async_refresh(self):
+        """Write state only when the value changed."""
+        self._refresh = None
+        value = self._value()
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class NoonlightLatencySensor(NoonlightDiagnosticSensor):
+    """Alarm creation latency."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, noonlight_integration, key, name, value_fn):
+        """Initialize the sensor."""
+        super().__init__(noonlight_integration, key, name, "create", value_fn)
+
+    def _value(self):
+        """Return the latency in milliseconds."""
+        seconds = super()._value()
+        return None if seconds is None else seconds * 1000
+
+
+class NoonlightPollErrorRateSensor(NoonlightDiagnosticSensor):
+    """Share of failed status polls."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_icon = "mdi:alert-circle-outline"
+
+    def __init__(self, noonlight_integration):
+        """Initialize the sensor."""
+        super().__init__(
+            noonlight_integration,
+            "poll_error_rate",
+            "Status Poll Error Rate",
+            "status",
+            _poll_error_rate,
+        )
+
+
+class NoonlightCoordinatorSensor(CoordinatorEntity, SensorEntity):
+    """Base class for sensors fed by the alarm coordinator.
+
+    The value is recomputed on every coordinator update and the state is
+    only written when it changed.
+    """
+
+    def __init__(self, noonlight_integration, key, name, value_fn):
+        """Initialize the sensor."""
+        super().__init__(noonlight_integration.coordinator)
+        self.noonlight = noonlight_integration
+        self._value_fn = value_fn
+        self._attr_unique_id = (
+            f"{key}_{Platform.SENSOR}_{self.noonlight.config.get('id', '')}"
+        )
+        self._attr_name = f"Noonlight2 {name}"
+        self._attr_device_info = self.noonlight.device_info
+        self._attr_native_value = value_fn(self.coordinator.data)
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only when the value changed."""
+        value = self._value_fn(self.coordinator.data)
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class NoonlightAlarmStatusSensor(NoonlightCoordinatorSensor):
+    """Status of the current alarm."""
+
+    _attr_icon = "mdi:alarm-light-outline"
+
+    def __init__(self, noonlight_integration):
+        """Initialize the sensor."""
+        super().__init__(
+            noonlight_integration, "alarm_status", "Alarm Status", _alarm_status
+        )
+
+
+class NoonlightAlarmAgeSensor(NoonlightCoordinatorSensor):
+    """Minutes since the current alarm was created.
+
+    Refreshed by the status polls of the alarm; a minute resolution keeps
+    it from writing state on every poll.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, noonlight_integration):
+        """Initialize the sensor."""
+        super().__init__(noonlight_integration, "alarm_age", "Alarm Age", _alarm_age)
+
+
+class NoonlightLastContactSensor(NoonlightCoordinatorSensor):
+    """Time of the last successful API response."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_icon = "mdi:cloud-check-outline"
+
+    def __init__(self, noonlight_integration):
+        """Initialize the sensor."""
+        super().__init__(
+            noonlight_integration,
+            "last_api_contact",
+            "Last API Contact",
+            _last_contact,
+        )
+
+
+class NoonlightCountdownSensor(NoonlightCoordinatorSensor):
+    """Seconds left before a pending alarm is sent; unknown when none is."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-alert-outline"
+
+    def __init__(self, noonlight_integration):
+        """Initialize the sensor."""
+        super().__init__(
+            noonlight_integration, "alarm_countdown", "Alarm Countdown", _countdown
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the services of the pending alarm."""
+        return {"services": sorted(self.coordinator.data["countdown_services"])}
@@ -0,0 +1,123 @@
+"""Noonlight services, shared by all config entries."""
+
+import hmac
+import logging
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    ALARM_RESULT_COUNTDOWN,
+    ATTR_CONFIG_ENTRY_ID,
+    CONF_PIN,
+    CONST_NOONLIGHT_HA_SERVICE_CANCEL_COUNTDOWN,
+    CONST_NOONLIGHT_HA_SERVICE_CREATE_ALARM,
+    CONST_NOONLIGHT_SERVICE_TYPES,
+    CONST_NOONLIGHT_HA_SERVICE_PROFILE_ALARM_PATH,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _async_get_integration(hass: HomeAssistant, call: ServiceCall):
+    """Return the integration of the config entry a service call targets.
+
+    A call names its site with `config_entry_id` or `device_id`. Either
+    may be left out while only one site is configured.
+    """
+    integrations = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    device_id = call.data.get(ATTR_DEVICE_ID)
+    if device_id is not None:
+        device = dr.async_get(hass).async_get(device_id)
+        if device is None:
+            raise ServiceValidationError(f"Unknown device: {device_id}")
+        entry_ids = [e for e in device.config_entries if e in integrations]
+        if not entry_ids:
+            raise ServiceValidationError(f"{device_id} is not a Noonlight device")
+        if entry_id is not None and entry_id not in entry_ids:
+            raise ServiceValidationError(
+                f"Device {device_id} does not belong to config entry {entry_id}"
+            )
+        entry_id = entry_ids[0]
+
+    if entry_id is None:
+        if len(integrations) != 1:
+            raise ServiceValidationError(
+                f"{len(integrations)} Noonlight sites are loaded, "
+                f"set {ATTR_CONFIG_ENTRY_ID} or {ATTR_DEVICE_ID}"
+            )
+        return next(iter(integrations.values()))
+    if entry_id not in integrations:
+        raise ServiceValidationError(f"Noonlight config entry not loaded: {entry_id}")
+    return integrations[entry_id]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Noonlight services."""
+
+    async def handle_create_alarm_service(call: ServiceCall):
+        """Create a Noonlight alarm, or escalate the active one."""
+        noonlight_integration = _async_get_integration(hass, call)
+        service = call.data.get("service", None)
+        instruction = call.data.get("instruction")  # new optional field
+        countdown = call.data.get("countdown")
+        if countdown:
+            if service not in CONST_NOONLIGHT_SERVICE_TYPES:
+                raise ServiceValidationError(f"Unknown Noonlight service: {service}")
+            noonlight_integration.countdown.start(
+                {service: True}, countdown, instruction
+            )
+            return {"result": ALARM_RESULT_COUNTDOWN, "alarm": None}
+        alarm, result = await noonlight_integration.async_request_alarm(
+            alarm_types=[service],
+            instruction=instruction,
+        )
+        return {
+            "result": result,
+            "alarm": None if alarm is None else alarm.as_dict(),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        CONST_NOONLIGHT_HA_SERVICE_CREATE_ALARM,
+        handle_create_alarm_service,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_cancel_countdown_service(call: ServiceCall):
+        """Cancel the alarm countdown after checking the PIN."""
+        noonlight_integration = _async_get_integration(hass, call)
+        if not hmac.compare_digest(
+            str(call.data.get(CONF_PIN, "")), str(noonlight_integration.pin)
+        ):
+            raise ServiceValidationError("Incorrect Noonlight PIN")
+        canceled = noonlight_integration.countdown.cancel("PIN entered")
+        return {"canceled": canceled}
+
+    hass.services.async_register(
+        DOMAIN,
+        CONST_NOONLIGHT_HA_SERVICE_CANCEL_COUNTDOWN,
+        handle_cancel_countdown_service,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def handle_profile_alarm_path_service(call: ServiceCall):
+        """Dump the buffered alarm path traces."""
+        noonlight_integration = _async_get_integration(hass, call)
+        spans = noonlight_integration.tracer.dump()
+        if not noonlight_integration.tracer.enabled:
+            _LOGGER.warning("Noonlight tracing is disabled in the integration options")
+        for span in spans:
+            _LOGGER.info(f"[profile_alarm_path] {span}")
+        return {"tracing": noonlight_integration.tracer.enabled, "spans": spans}
+
+    hass.services.async_register(
+        DOMAIN,
+        CONST_NOONLIGHT_HA_SERVICE_PROFILE_ALARM_PATH,
+        handle_profile_alarm_path_service,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -1,22 +1,31 @@
-"""Create a switch to trigger an alarm in Noonlight."""
+"""Create switches to trigger an alarm in Noonlight."""
 import logging
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    EVENT_NOONLIGHT_ALARM_CANCELED,
-    EVENT_NOONLIGHT_ALARM_CREATED,
     EVENT_NOONLIGHT_TOKEN_REFRESHED,
+    NOONLIGHT_SERVICES_FIRE,
+    NOONLIGHT_SERVICES_MEDICAL,
+    NOONLIGHT_SERVICES_POLICE,
 )
 
 DEFAULT_NAME = "Noonlight2 Switch"
 _LOGGER = logging.getLogger(__name__)
 
+# service, name, icon
+SERVICE_SWITCHES = (
+    (NOONLIGHT_SERVICES_POLICE, DEFAULT_NAME, "mdi:police-badge"),
+    (NOONLIGHT_SERVICES_FIRE, "Noonlight2 Fire Switch", "mdi:fire-truck"),
+    (NOONLIGHT_SERVICES_MEDICAL, "Noonlight2 Medical Switch", "mdi:ambulance"),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -29,75 +38,76 @@ async def async_setup_entry(
     _LOGGER.debug(f"[aync_setup_entry] config_entry: {config_entry.data}")
 
     noonlight_integration = hass.data.get(DOMAIN).get(config_entry.entry_id)
-    noonlight_switch = NoonlightSwitch(noonlight_integration)
-    async_add_entities([noonlight_switch])
-
-    def noonlight_token_refreshed():
-        noonlight_switch.schedule_update_ha_state()
-
-    def noonlight_alarm_canceled():
-        noonlight_switch._state = False
-        noonlight_switch.schedule_update_ha_state()
-
-    def noonlight_alarm_created():
-        noonlight_switch._state = True
-        noonlight_switch.schedule_update_ha_state()
-
-    async_dispatcher_connect(
-        hass, EVENT_NOONLIGHT_TOKEN_REFRESHED, noonlight_token_refreshed
-    )
-
-    async_dispatcher_connect(
-        hass, EVENT_NOONLIGHT_ALARM_CANCELED, noonlight_alarm_canceled
-    )
-
-    async_dispatcher_connect(
-        hass, EVENT_NOONLIGHT_ALARM_CREATED, noonlight_alarm_created
+    async_add_entities(
+        NoonlightSwitch(noonlight_integration, service, name, icon)
+        for service, name, icon in SERVICE_SWITCHES
     )
 
 
-class NoonlightSwitch(SwitchEntity):
-    """Noonlight Alarm Switch."""
+class NoonlightSwitch(CoordinatorEntity, SwitchEntity):
+    """Noonlight Alarm Switch for one emergency service."""
 
-    def __init__(self, noonlight_integration):
+    def __init__(self, noonlight_integration, alarm_type, name, icon):
         """Initialize the Noonlight switch."""
+        super().__init__(noonlight_integration.coordinator)
         self.noonlight = noonlight_integration
-        self._alarm_type = "police"
-        self._attr_unique_id = f"{self._alarm_type.lower()}_{Platform.SWITCH}_{
-            self.noonlight.config.get('id', '')}"
-        self._attr_name = DEFAULT_NAME
-        self._attr_icon = "mdi:police-badge"
-        self._state = False
+        self._alarm_type = alarm_type
+        self._attr_unique_id = (
+            f"{self._alarm_type.lower()}_{Platform.SWITCH}_"
+            f"{self.noonlight.config.get('id', '')}"
+        )
+        self._attr_name = name
+        self._attr_icon = icon
+        self._attr_device_info = self.noonlight.device_info
+        self._slice = None
+        self._update_from_data()
+
+    async def async_added_to_hass(self):
+        """Subscribe to the coordinator and the token signal of this entry."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                EVENT_NOONLIGHT_TOKEN_REFRESHED.format(self.noonlight.entry_id),
+                self._async_token_refreshed,
+            )
+        )
+
+    @callback
+    def _async_token_refreshed(self):
+        """Refresh availability after a token change."""
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only when this switch's part of the data changed."""
+        if self._update_from_data():
+            self.async_write_ha_state()
+
+    def _update_from_data(self):
+        """Update from the coordinator data and return whether it changed."""
+        data = self.coordinator.data
+        slice_ = (data["alarm_id"], data["status"], data["services"])
+        if slice_ == self._slice:
+            return False
+        self._slice = slice_
+        self._attr_is_on = self._alarm_type in data["services"]
+        attr = {}
+        if data["alarm_id"] is not None:
+            attr["alarm_status"] = data["status"]
+            attr["alarm_id"] = data["alarm_id"]
+            attr["alarm_services"] = {service: True for service in data["services"]}
+        self._attr_extra_state_attributes = attr
+        return True
 
     @property
     def available(self):
         """Ensure that the Noonlight server token is valid."""
-        return bool(self.noonlight.server_token)
-
-    @property
-    def extra_state_attributes(self):
-        """Return the current alarm attributes, when active."""
-        attr = {}
-        if self.noonlight._alarm is not None:
-            alarm = self.noonlight._alarm
-            attr["alarm_status"] = alarm.get('status')
-            attr["alarm_id"] = alarm.get('id')
-            attr["alarm_services"] = alarm.get('services', {})
-        return attr
-
-    @property
-    def is_on(self):
-        """Return the status of the switch."""
-        return self._state
+        return self.noonlight.token_valid
 
     async def async_turn_on(self, **kwargs):
-        """Activate an alarm. Defaults to `police` services."""
-        if self.noonlight._alarm is None:
-            await self.noonlight.create_alarm()
-            if self.noonlight._alarm is not None:
-                self._state = True
+        """Activate an alarm with this switch's service."""
+        await self.noonlight.create_alarm(alarm_types=[self._alarm_type])
 
     async def async_turn_off(self, **kwargs):
-        """Turn off the switch if the active alarm is canceled."""
-        if self.noonlight._alarm is None:
-            self._state = False
+        """Do nothing; an alarm is canceled with the PIN through Noonlight."""
@@ -0,0 +1,186 @@
+"""Optional phase-level tracing of Noonlight API calls."""
+
+import logging
+from collections import deque
+
+import aiohttp
+import homeassistant.util.dt as dt_util
+
+from .const import TRACE_BUFFER_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _NullSpan:
+    """Span used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def phase(self, name):
+        return self
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Timed span with named phases, recorded when it ends."""
+
+    __slots__ = ("_tracer", "name", "attributes", "phases", "_start", "_phase")
+
+    def __init__(self, tracer, name, attributes) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.phases = {}
+        self._start = 0.0
+        self._phase = None
+
+    def __enter__(self):
+        self._start = self._tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.attributes["error"] = f"{type(exc).__name__}: {exc}"
+        self._tracer.record(
+            self.name, self._start, self._tracer.clock(), self.phases, self.attributes
+        )
+        return False
+
+    def phase(self, name):
+        """Time a phase of this span: `with span.phase("payload_build"): ...`."""
+        return _Phase(self, name)
+
+
+class _Phase:
+    """Context manager timing one phase of a span."""
+
+    __slots__ = ("_span", "_name", "_start")
+
+    def __init__(self, span, name) -> None:
+        self._span = span
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = self._span._tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = self._span._tracer.clock() - self._start
+        self._span.phases[self._name] = round(elapsed * 1000, 3)
+        return False
+
+
+class AlarmTracer:
+    """Record spans of the alarm path in a bounded buffer and the debug log.
+
+    HTTP requests are traced with aiohttp trace hooks, splitting each one
+    into DNS, connection pool wait, connect (TCP and TLS), request send
+    and server time. Non-HTTP work such as building the payload or the
+    entity fan-out is timed with `span()`. When disabled, `span()`
+    returns a shared no-op object and no trace hooks are installed.
+    """
+
+    def __init__(self, clock, enabled: bool = False) -> None:
+        """Initialize the tracer; `clock` returns monotonic seconds."""
+        self.clock = clock
+        self.enabled = enabled
+        self.spans = deque(maxlen=TRACE_BUFFER_SIZE)
+
+    def span(self, name: str, **attributes):
+        """Return a context manager timing a span."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attributes)
+
+    def record(self, name, start, end, phases, attributes) -> None:
+        """Store a finished span and write it to the debug log."""
+        span = {
+            "name": name,
+            "time": dt_util.utcnow().isoformat(),
+            "duration_ms": round((end - start) * 1000, 3),
+            "phases_ms": phases,
+            **attributes,
+        }
+        self.spans.append(span)
+        _LOGGER.debug(f"[trace] {span}")
+
+    def dump(self) -> list[dict]:
+        """Return the buffered spans, oldest first."""
+        return list(self.spans)
+
+    def trace_configs(self) -> list[aiohttp.TraceConfig]:
+        """Return the aiohttp trace hooks, if tracing is enabled."""
+        if not self.enabled:
+            return []
+
+        trace_config = aiohttp.TraceConfig()
+
+        def _mark(name):
+            async def _on_event(session, ctx, params):
+                ctx.marks[name] = self.clock()
+
+            return _on_event
+
+        async def _on_request_start(session, ctx, params):
+            ctx.marks = {"start": self.clock()}
+
+        async def _on_request_end(session, ctx, params):
+            self._record_request(ctx, params.method, params.url, params.response.status)
+
+        async def _on_request_exception(session, ctx, params):
+            self._record_request(
+                ctx,
+                params.method,
+                params.url,
+                None,
+                error=f"{type(params.exception).__name__}: {params.exception}",
+            )
+
+        trace_config.on_request_start.append(_on_request_start)
+        trace_config.on_dns_resolvehost_start.append(_mark("dns_start"))
+        trace_config.on_dns_resolvehost_end.append(_mark("dns_end"))
+        trace_config.on_connection_queued_start.append(_mark("queued_start"))
+        trace_config.on_connection_queued_end.append(_mark("queued_end"))
+        trace_config.on_connection_create_start.append(_mark("connect_start"))
+        trace_config.on_connection_create_end.append(_mark("connect_end"))
+        trace_config.on_connection_reuseconn.append(_mark("reused"))
+        trace_config.on_request_headers_sent.append(_mark("sent"))
+        trace_config.on_request_end.append(_on_request_end)
+        trace_config.on_request_exception.append(_on_request_exception)
+        return [trace_config]
+
+    def _record_request(self, ctx, method, url, status, error=None) -> None:
+        """Turn the marks of one request into a span."""
+        end = self.clock()
+        marks = ctx.marks
+        phases = {}
+        for phase, start_mark, end_mark in (
+            ("dns", "dns_start", "dns_end"),
+            ("pool_wait", "queued_start", "queued_end"),
+            ("connect", "connect_start", "connect_end"),
+        ):
+            if start_mark in marks and end_mark in marks:
+                phases[phase] = round((marks[end_mark] - marks[start_mark]) * 1000, 3)
+        if "sent" in marks:
+            phases["send"] = round((marks["sent"] - marks["start"]) * 1000, 3)
+            phases["server"] = round((end - marks["sent"]) * 1000, 3)
+
+        attributes = {
+            "request": f"{method} {url.path}",
+            "status": status,
+            "reused_connection": "reused" in marks,
+        }
+        if ctx.trace_request_ctx:
+            attributes.update(ctx.trace_request_ctx)
+        if error is not None:
+            attributes["error"] = error
+        self.record("http", marks["start"], end, phases, attributes)
@@ -0,0 +1,163 @@
+"""Dedicated, pre-warmed HTTP transport for the Noonlight API."""
+
+import asyncio
+import logging
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util.ssl import client_context
+
+from .const import (
+    TRANSPORT_CONNECTION_LIMIT,
+    TRANSPORT_DNS_CACHE_TTL,
+    TRANSPORT_KEEPALIVE_INTERVAL,
+    TRANSPORT_KEEPALIVE_TIMEOUT,
+    TRANSPORT_RECONNECT_MAX_DELAY,
+    TRANSPORT_RECONNECT_MIN_DELAY,
+    TRANSPORT_WARM_TIMEOUT,
+)
+from .endpoints import CIRCUIT_CLOSED, EndpointPool
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NoonlightTransport:
+    """Integration-owned connection pool kept warm for the API endpoints.
+
+    The shared Home Assistant session may have no open connection to the
+    Noonlight API when an emergency happens, so the first alarm after an
+    idle period would pay for DNS, TCP and TLS. This transport opens the
+    connections during setup and keeps them alive with cheap requests so
+    that `POST /alarms` goes out on an already-open socket, including
+    after a failover. Endpoint health is tracked in `endpoints`.
+
+    Requests other than alarm writes hold a `deferrable` slot, which caps
+    them at one connection less than the pool, so a create never waits
+    behind polls for a free connection.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api_endpoints: tuple[str, ...], trace_configs=None
+    ) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self.api_endpoints = api_endpoints
+        self.endpoints = EndpointPool(hass, api_endpoints, self._async_head)
+        self._trace_configs = trace_configs or []
+        self.deferrable = asyncio.Semaphore(TRANSPORT_CONNECTION_LIMIT - 1)
+        self.connected = False
+        self._session: aiohttp.ClientSession | None = None
+        self._cancel_keepalive = None
+        self._cancel_reconnect = None
+        self._reconnect_delay = TRANSPORT_RECONNECT_MIN_DELAY
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the dedicated client session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=client_context(),
+                limit_per_host=TRANSPORT_CONNECTION_LIMIT,
+                ttl_dns_cache=TRANSPORT_DNS_CACHE_TTL,
+                keepalive_timeout=TRANSPORT_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": SERVER_SOFTWARE},
+                trace_configs=self._trace_configs,
+            )
+        return self._session
+
+    async def async_start(self) -> None:
+        """Open the first connection and start the keepalive timer."""
+        if self._cancel_keepalive is None:
+            self._cancel_keepalive = async_track_time_interval(
+                self.hass, self._async_keepalive, TRANSPORT_KEEPALIVE_INTERVAL
+            )
+        await self.async_warm()
+
+    async def async_stop(self) -> None:
+        """Stop the keepalive timer and probes and close the pool."""
+        self.endpoints.stop()
+        if self._cancel_keepalive is not None:
+            self._cancel_keepalive()
+            self._cancel_keepalive = None
+        if self._cancel_reconnect is not None:
+            self._cancel_reconnect()
+            self._cancel_reconnect = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.connected = False
+
+    async def async_warm(self) -> bool:
+        """Open a connection to every endpoint whose circuit is closed.
+
+        Endpoints with an open circuit are left to the pool's probes.
+        """
+        urls = [
+            health.url
+            for health in self.endpoints.endpoints.values()
+            if health.state == CIRCUIT_CLOSED
+        ]
+        results = await asyncio.gather(*(self._async_head(url) for url in urls))
+        for url, ok in zip(urls, results):
+            if ok:
+                self.endpoints.record_success(url)
+            else:
+                self.endpoints.record_failure(url)
+
+        if not any(results):
+            self.connected = False
+            self._schedule_reconnect()
+            return False
+
+        self.connected = True
+        self._reconnect_delay = TRANSPORT_RECONNECT_MIN_DELAY
+        return True
+
+    async def _async_head(self, url: str) -> bool:
+        """Make a cheap request so a connection to `url` is open in the pool.
+
+        Any HTTP response, including 4xx, means DNS, TCP and TLS are done
+        and the connection went back to the pool.
+        """
+        try:
+            async with self.deferrable, self.session.head(
+                url,
+                timeout=aiohttp.ClientTimeout(total=TRANSPORT_WARM_TIMEOUT),
+            ) as resp:
+                _LOGGER.debug(f"[transport] warm {url}: {resp.status}")
+        except (aiohttp.ClientError, TimeoutError) as e:
+            _LOGGER.debug(f"[transport] warm {url} failed: {e}")
+            return False
+        return True
+
+    async def _async_keepalive(self, now) -> None:
+        """Keep the pooled connection from idling out."""
+        if self._cancel_reconnect is not None:
+            return
+        await self.async_warm()
+
+    @callback
+    def _schedule_reconnect(self) -> None:
+        """Retry opening the connection in the background with backoff."""
+        if self._cancel_reconnect is not None or self._cancel_keepalive is None:
+            return
+
+        async def _async_reconnect(now):
+            self._cancel_reconnect = None
+            await self.async_warm()
+
+        _LOGGER.debug(
+            f"[transport] reconnecting to {', '.join(self.api_endpoints)} "
+            f"in {self._reconnect_delay}s"
+        )
+        self._cancel_reconnect = async_call_later(
+            self.hass, self._reconnect_delay, _async_reconnect
+        )
+        self._reconnect_delay = min(
+            self._reconnect_delay * 2, TRANSPORT_RECONNECT_MAX_DELAY
+        )
@@ -0,0 +1,182 @@
+"""Create Noonlight alarms directly from entity state changes."""
+
+import logging
+
+from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.start import async_at_started
+
+from .const import (
+    CONF_RULE_CONDITION_ENTITY,
+    CONF_RULE_CONDITION_STATE,
+    CONF_RULE_DELAY,
+    CONF_RULE_ENTITY,
+    CONF_RULE_SERVICE,
+    CONF_RULE_STATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TriggerRule:
+    """Request `service` when `entity_id` changes to `to_state`.
+
+    When a condition entity is set, the rule only fires while it is in
+    `condition_state`. A rule with a delay starts the entry's countdown,
+    which the condition entity leaving its state cancels.
+    """
+
+    __slots__ = (
+        "entity_id",
+        "to_state",
+        "service",
+        "condition_entity_id",
+        "condition_state",
+        "delay",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        to_state: str,
+        service: str,
+        condition_entity_id: str | None = None,
+        condition_state: str | None = None,
+        delay: float = 0,
+    ) -> None:
+        """Initialize the rule."""
+        self.entity_id = entity_id
+        self.to_state = to_state
+        self.service = service
+        self.condition_entity_id = condition_entity_id
+        self.condition_state = condition_state
+        self.delay = delay
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TriggerRule":
+        """Create a rule from its options entry."""
+        return cls(
+            data[CONF_RULE_ENTITY],
+            data[CONF_RULE_STATE],
+            data[CONF_RULE_SERVICE],
+            data.get(CONF_RULE_CONDITION_ENTITY) or None,
+            data.get(CONF_RULE_CONDITION_STATE) or None,
+            data.get(CONF_RULE_DELAY, 0),
+        )
+
+
+def describe_rule(data: dict) -> str:
+    """Return a one-line description of a rule options entry."""
+    text = (
+        f"{data[CONF_RULE_ENTITY]} {data[CONF_RULE_STATE]} "
+        f"→ {data[CONF_RULE_SERVICE]}"
+    )
+    if data.get(CONF_RULE_CONDITION_ENTITY):
+        text += (
+            f" while {data[CONF_RULE_CONDITION_ENTITY]} "
+            f"{data.get(CONF_RULE_CONDITION_STATE)}"
+        )
+    if data.get(CONF_RULE_DELAY):
+        text += f" after {data[CONF_RULE_DELAY]:g}s"
+    return text
+
+
+class AlarmTriggerEngine:
+    """Evaluate trigger rules on state changes, without automations.
+
+    Rules are indexed by trigger entity when the entry is set up, so a
+    state change costs one dictionary lookup and the rules of that entity
+    only. A matching rule requests the alarm directly, or starts the
+    countdown when it has a delay.
+
+    Only real transitions fire rules: listening starts once Home Assistant
+    has started, and changes from no state, `unavailable` or `unknown`
+    are ignored, so entities being restored or coming back online do not
+    dispatch an alarm.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, async_request_alarm, countdown, rules
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._async_request_alarm = async_request_alarm
+        self._countdown = countdown
+        index: dict[str, list[TriggerRule]] = {}
+        for data in rules:
+            rule = TriggerRule.from_dict(data)
+            index.setdefault(rule.entity_id, []).append(rule)
+        self._index = {entity_id: tuple(rules) for entity_id, rules in index.items()}
+        self._unsub_state = None
+        self._unsub_started = None
+
+    @callback
+    def start(self) -> None:
+        """Listen to the trigger entities once Home Assistant has started."""
+        if self._index and self._unsub_started is None:
+            self._unsub_started = async_at_started(self.hass, self._async_listen)
+
+    @callback
+    def _async_listen(self, hass: HomeAssistant) -> None:
+        if self._unsub_state is None:
+            self._unsub_state = async_track_state_change_event(
+                hass, list(self._index), self._async_state_changed
+            )
+
+    @callback
+    def stop(self) -> None:
+        """Stop listening."""
+        if self._unsub_started is not None:
+            self._unsub_started()
+            self._unsub_started = None
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+
+    def _condition_met(self, rule: TriggerRule) -> bool:
+        if rule.condition_entity_id is None:
+            return True
+        state = self.hass.states.get(rule.condition_entity_id)
+        return state is not None and state.state == rule.condition_state
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Fire the rules of the entity that changed."""
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+        old_state = event.data.get("old_state")
+        if old_state is None or old_state.state in (
+            STATE_UNAVAILABLE,
+            STATE_UNKNOWN,
+            new_state.state,
+        ):
+            return
+
+        for rule in self._index.get(new_state.entity_id, ()):
+            if new_state.state != rule.to_state:
+                continue
+            if not self._condition_met(rule):
+                continue
+            name = new_state.attributes.get(ATTR_FRIENDLY_NAME, new_state.entity_id)
+            if not rule.delay:
+                self._fire(rule, name)
+                continue
+            self._countdown.start(
+                {rule.service: True},
+                rule.delay,
+                f"Triggered by {name}",
+                rule.condition_entity_id,
+                rule.condition_state,
+            )
+
+    @callback
+    def _fire(self, rule: TriggerRule, name: str) -> None:
+        _LOGGER.warning(f"{name} is {rule.to_state}, requesting {rule.service}")
+        self.hass.async_create_task(
+            self._async_request_alarm(
+                alarm_types=[rule.service],
+                instruction=f"Triggered by {name}",
+            )
+        )
@@ -0,0 +1 @@
+"""Tests for the Noonlight2 integration."""
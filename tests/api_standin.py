@@ -0,0 +1,212 @@
+"""Local stand-in for the Noonlight dispatch API."""
+
+import asyncio
+import itertools
+import ssl
+import threading
+
+from aiohttp import web
+
+STATUS_ACTIVE = "ACTIVE"
+STATUS_CANCELED = "CANCELED"
+
+
+class NoonlightStandIn:
+    """Serve `POST /alarms` and the alarm status endpoints on localhost.
+
+    The server runs on its own thread and event loop, so its work is not
+    counted against the Home Assistant loop under test. Behavior is set
+    through attributes:
+
+    `latency` delays every response, and `create_latencies` gives the
+    delays of the next `POST /alarms` requests in order. `create_failures`
+    lists statuses returned by the next `POST /alarms` requests; with
+    `commit_failures` the alarm is still created, as when the response is
+    lost on the way back. Like the real API as far as is known, a repeated
+    `Idempotency-Key` creates another alarm; `honor_idempotency` makes it
+    return the alarm created for it instead.
+
+    `status_latency` delays `GET /alarms/{id}/status` on top of `latency`,
+    and `status_failures` lists statuses returned by the next ones.
+    `status_body` replaces its response body; a string is sent as is,
+    with `status_content_type`.
+
+    Bodies posted to `/alarms/{id}/events` and `/alarms/{id}/locations`
+    are kept in `posted`, and `post_latency` delays their responses.
+    `max_in_flight` is the most of them handled at once.
+
+    With `ssl_context` the stand-in serves HTTPS, so connecting to it
+    costs a TLS handshake as the real API does.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext | None = None) -> None:
+        """Initialize the stand-in."""
+        self.ssl_context = ssl_context
+        self.latency = 0.0
+        self.create_latencies: list[float] = []
+        self.create_failures: list[int] = []
+        self.commit_failures = False
+        self.honor_idempotency = False
+        self.status_latency = 0.0
+        self.status_failures: list[int] = []
+        self.status_body = None
+        self.status_content_type = "text/plain"
+        self.alarms: dict[str, dict] = {}
+        self.create_keys: list[str | None] = []
+        self.canceled: list[str] = []
+        self.requests: list[tuple[str, str]] = []
+        self.post_latency = 0.0
+        self.posted: dict[str, list] = {}
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self.url = None
+        self._ids = itertools.count(1)
+        self._by_key: dict[str, str] = {}
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._error = None
+
+    @property
+    def created(self) -> list[dict]:
+        """Return the alarms created so far, in order."""
+        return list(self.alarms.values())
+
+    def start(self) -> None:
+        """Start serving on a free localhost port."""
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(ready,), name="noonlight-standin"
+        )
+        self._thread.start()
+        ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+
+    def stop(self) -> None:
+        """Stop the server and its thread."""
+        asyncio.run_coroutine_threadsafe(
+            self._runner.cleanup(), self._loop
+        ).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _run(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get("/", self._handle_root)
+        app.router.add_post("/alarms", self._handle_create)
+        app.router.add_get("/alarms/{alarm_id}/status", self._handle_get_status)
+        app.router.add_post("/alarms/{alarm_id}/status", self._handle_set_status)
+        app.router.add_patch("/alarms/{alarm_id}", self._handle_update)
+        app.router.add_post("/alarms/{alarm_id}/{kind}", self._handle_accept)
+        self._runner = web.AppRunner(app)
+        try:
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(
+                self._runner, "127.0.0.1", 0, ssl_context=self.ssl_context
+            )
+            self._loop.run_until_complete(site.start())
+        except Exception as e:
+            self._error = e
+            ready.set()
+            return
+        port = site._server.sockets[0].getsockname()[1]
+        scheme = "http" if self.ssl_context is None else "https"
+        self.url = f"{scheme}://127.0.0.1:{port}"
+        ready.set()
+        self._loop.run_forever()
+
+    async def _delay(self, latency: float | None = None) -> None:
+        latency = self.latency if latency is None else latency
+        if latency:
+            await asyncio.sleep(latency)
+
+    async def _handle_root(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _handle_create(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path))
+        key = request.headers.get("Idempotency-Key")
+        self.create_keys.append(key)
+        body = await request.json()
+        latency = self.create_latencies.pop(0) if self.create_latencies else None
+        failure = self.create_failures.pop(0) if self.create_failures else None
+        if failure is None or self.commit_failures:
+            alarm = self._create(key, body)
+        await self._delay(latency)
+        if failure is not None:
+            return web.json_response({"message": "stand-in failure"}, status=failure)
+        return web.json_response(alarm, status=201)
+
+    def _create(self, key: str | None, body: dict) -> dict:
+        if self.honor_idempotency and key in self._by_key:
+            return self.alarms[self._by_key[key]]
+        alarm_id = f"alarm-{next(self._ids)}"
+        alarm = {
+            "id": alarm_id,
+            "status": STATUS_ACTIVE,
+            "services": body.get("services", {}),
+            "instructions": body.get("instructions"),
+        }
+        self.alarms[alarm_id] = alarm
+        if key is not None:
+            self._by_key[key] = alarm_id
+        return alarm
+
+    async def _handle_get_status(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path))
+        await self._delay(self.latency + self.status_latency)
+        if self.status_failures:
+            return web.json_response(
+                {"message": "stand-in failure"}, status=self.status_failures.pop(0)
+            )
+        if isinstance(self.status_body, str):
+            return web.Response(
+                text=self.status_body, content_type=self.status_content_type
+            )
+        if self.status_body is not None:
+            return web.json_response(self.status_body)
+        alarm = self.alarms.get(request.match_info["alarm_id"])
+        if alarm is None:
+            return web.json_response({"message": "not found"}, status=404)
+        return web.json_response({"id": alarm["id"], "status": alarm["status"]})
+
+    async def _handle_set_status(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path))
+        await self._delay()
+        alarm_id = request.match_info["alarm_id"]
+        alarm = self.alarms.get(alarm_id)
+        if alarm is None:
+            return web.json_response({"message": "not found"}, status=404)
+        alarm["status"] = (await request.json())["status"]
+        if alarm["status"] == STATUS_CANCELED:
+            self.canceled.append(alarm_id)
+        return web.json_response(alarm, status=201)
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path))
+        await self._delay()
+        alarm = self.alarms.get(request.match_info["alarm_id"])
+        if alarm is None:
+            return web.json_response({"message": "not found"}, status=404)
+        body = await request.json()
+        if "services" in body:
+            alarm["services"] = body["services"]
+        return web.json_response(alarm)
+
+    async def _handle_accept(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.path))
+        self.posted.setdefault(request.match_info["kind"], []).append(
+            await request.json()
+        )
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            await self._delay(self.latency + self.post_latency)
+        finally:
+            self._in_flight -= 1
+        return web.json_response({}, status=201)
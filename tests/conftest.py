@@ -0,0 +1,83 @@
+"""Fixtures for the Noonlight2 tests."""
+
+import pytest
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.noonlight2 import NoonlightIntegration
+from custom_components.noonlight2.const import (
+    CONF_API_ENDPOINT,
+    CONF_PHONE_NUMBER,
+    CONF_SERVER_TOKEN,
+    DOMAIN,
+)
+from custom_components.noonlight2.hub import NoonlightHub
+
+from .api_standin import NoonlightStandIn
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the integration in every test."""
+    yield
+
+
+@pytest.fixture
+def noonlight_api(socket_enabled):
+    """Return a running Noonlight API stand-in."""
+    api = NoonlightStandIn()
+    api.start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def noonlight_config(noonlight_api) -> dict:
+    """Return entry data pointed at the stand-in."""
+    return {
+        CONF_SERVER_TOKEN: "test-token",
+        CONF_API_ENDPOINT: noonlight_api.url,
+        CONF_PHONE_NUMBER: "5555555555",
+        "pin": "1234",
+    }
+
+
+@pytest.fixture
+def noonlight_options() -> dict:
+    """Return the entry options; override to configure a test."""
+    return {}
+
+
+@pytest.fixture
+async def noonlight(hass: HomeAssistant, noonlight_config, noonlight_options):
+    """Return a started integration object talking to the stand-in."""
+    integration = NoonlightIntegration(
+        hass,
+        noonlight_config,
+        noonlight_options,
+        "test_entry",
+        NoonlightHub(hass),
+    )
+    await integration.async_restore()
+    yield integration
+    await integration.async_stop()
+    await hass.async_block_till_done()
+
+
+@pytest.fixture
+async def config_entry(hass: HomeAssistant, noonlight_config, noonlight_options):
+    """Return a config entry pointed at the stand-in, set up in Home Assistant."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Home",
+        data={**noonlight_config, CONF_WEBHOOK_ID: "test-webhook-id"},
+        options=noonlight_options,
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,89 @@
+"""Tests for alarm creation through the integration."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockEntityPlatform
+
+from custom_components.noonlight2.const import (
+    ALARM_RESULT_CREATED,
+    ALARM_RESULT_JOINED,
+    ALARM_RESULT_UNCHANGED,
+)
+from custom_components.noonlight2.switch import NoonlightSwitch
+
+CALLERS = 50
+
+
+def _creates(noonlight_api) -> int:
+    return noonlight_api.requests.count(("POST", "/alarms"))
+
+
+async def test_create_alarm(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """An alarm is created once and its services are kept."""
+    alarm, result = await noonlight.async_request_alarm(["police"], "Front door")
+
+    assert result == ALARM_RESULT_CREATED
+    assert alarm is noonlight._alarm
+    assert alarm.services == {"police": True}
+    assert noonlight_api.alarms[alarm.id]["instructions"] == {"entry": "Front door"}
+    assert noonlight.outbox.intents == {}
+    assert alarm.id in noonlight.outbox.alarms
+
+    _, result = await noonlight.async_request_alarm(["police"])
+    assert result == ALARM_RESULT_UNCHANGED
+    assert _creates(noonlight_api) == 1
+
+
+async def test_concurrent_callers_share_one_alarm(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """Many simultaneous callers get the alarm of a single request."""
+    noonlight_api.create_latencies = [0.2]
+
+    results = await asyncio.gather(
+        *(noonlight.async_request_alarm(["police"]) for _ in range(CALLERS))
+    )
+
+    assert _creates(noonlight_api) == 1
+    alarms = {alarm.id for alarm, _ in results}
+    assert alarms == {noonlight._alarm.id}
+    outcomes = [result for _, result in results]
+    assert outcomes.count(ALARM_RESULT_CREATED) == 1
+    assert outcomes.count(ALARM_RESULT_JOINED) == CALLERS - 1
+
+
+async def test_joined_services_are_merged(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """Services asked for while the alarm is in flight are added to it."""
+    noonlight_api.create_latencies = [0.2]
+
+    await asyncio.gather(
+        noonlight.async_request_alarm(["police"]),
+        *(noonlight.async_request_alarm(["fire"]) for _ in range(CALLERS // 2)),
+        *(noonlight.async_request_alarm(["medical"]) for _ in range(CALLERS // 2)),
+    )
+
+    assert _creates(noonlight_api) == 1
+    expected = {"police": True, "fire": True, "medical": True}
+    assert noonlight._alarm.services == expected
+    assert noonlight_api.alarms[noonlight._alarm.id]["services"] == expected
+    assert noonlight_api.requests.count(
+        ("PATCH", f"/alarms/{noonlight._alarm.id}")
+    ) == 1
+
+
+async def test_switch_turn_on(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """Turning a switch on creates an alarm and turns the switch on."""
+    switch = NoonlightSwitch(noonlight, "fire", "Noonlight2 Fire Switch", "mdi:fire")
+    await MockEntityPlatform(hass).async_add_entities([switch])
+    assert hass.states.get(switch.entity_id).state == "off"
+
+    await switch.async_turn_on()
+    await hass.async_block_till_done()
+
+    state = hass.states.get(switch.entity_id)
+    assert state.state == "on"
+    assert state.attributes["alarm_id"] == noonlight._alarm.id
+    assert noonlight_api.created[0]["services"] == {"fire": True}
@@ -0,0 +1,116 @@
+"""Tests for the Noonlight API client."""
+
+import asyncio
+import time
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.noonlight2.api import NoonlightApiError, parse_retry_after
+from custom_components.noonlight2.const import TRANSPORT_CONNECTION_LIMIT
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [
+        (None, None),
+        ("", None),
+        ("120", 120.0),
+        ("-5", 0.0),
+        ("soon", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ],
+)
+def test_parse_retry_after(value, seconds) -> None:
+    """Seconds and past HTTP dates are parsed, anything else is ignored."""
+    assert parse_retry_after(value) == seconds
+
+
+async def test_status(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """The status response is decoded."""
+    alarm = await noonlight.create_alarm(["police"])
+
+    data = await noonlight.api.async_get_alarm_status(alarm.id)
+
+    assert data == {"id": alarm.id, "status": "ACTIVE"}
+
+
+async def test_http_error(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """An unexpected status raises with the HTTP status."""
+    with pytest.raises(NoonlightApiError) as err:
+        await noonlight.api.async_get_alarm_status("missing")
+
+    assert err.value.status == 404
+
+
+@pytest.mark.parametrize(
+    ("body", "content_type"),
+    [("<html>Bad gateway</html>", "text/html"), ("{", "application/json")],
+)
+async def test_response_is_not_json(
+    hass: HomeAssistant, noonlight, noonlight_api, body, content_type
+) -> None:
+    """A body that is not JSON raises instead of returning None."""
+    noonlight_api.status_body = body
+    noonlight_api.status_content_type = content_type
+
+    with pytest.raises(NoonlightApiError) as err:
+        await noonlight.api.async_get_alarm_status("alarm-1")
+
+    assert err.value.status == 200
+
+
+@pytest.mark.parametrize(
+    ("status", "valid"),
+    [
+        (None, True),
+        (404, True),
+        (401, False),
+        (403, False),
+        (400, None),
+        (429, None),
+        (500, None),
+        (503, None),
+    ],
+)
+async def test_validate_token(
+    hass: HomeAssistant, noonlight, noonlight_api, status, valid
+) -> None:
+    """Only 401 and 403 reject the token; throttling and 5xx are unknown."""
+    noonlight_api.status_body = {}
+    if status is not None:
+        noonlight_api.status_failures = [status]
+
+    assert await noonlight.api.async_validate_token() is valid
+
+
+async def test_validate_token_rate_limited(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """A check refused by the local rate limiter is not a rejected token."""
+    noonlight.limiter.record_throttled(60)
+
+    assert await noonlight.api.async_validate_token() is None
+    assert noonlight_api.requests == []
+
+
+async def test_create_is_not_starved_by_polls(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """Slow status requests leave a pooled connection free for a create."""
+    first = await noonlight.create_alarm(["police"])
+    noonlight_api.status_latency = 1.0
+    polls = [
+        hass.async_create_task(noonlight.api.async_get_alarm_status(first.id))
+        for _ in range(TRANSPORT_CONNECTION_LIMIT + 1)
+    ]
+    await asyncio.sleep(0.1)
+
+    start = time.perf_counter()
+    await noonlight.api.async_create_alarm(b'{"services":{"police":true}}')
+    elapsed = time.perf_counter() - start
+
+    # Without a free connection it would wait for a poll to finish
+    assert elapsed < noonlight_api.status_latency / 2
+    assert len(noonlight_api.created) == 2
+    await asyncio.gather(*polls)
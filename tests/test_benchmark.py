@@ -0,0 +1,258 @@
+"""Latency benchmarks against the local API stand-in.
+
+Every benchmark also runs as a regular test with a few rounds. Set
+`NOONLIGHT_BENCHMARK_ROUNDS` for more rounds and
+`NOONLIGHT_BENCHMARK_OUTPUT` to a file path to store the results as JSON,
+so they can be compared between releases:
+
+    NOONLIGHT_BENCHMARK_ROUNDS=500 NOONLIGHT_BENCHMARK_OUTPUT=bench.json \\
+        pytest tests/test_benchmark.py
+"""
+
+import ipaddress
+import json
+import os
+import platform
+import ssl
+import statistics
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockEntityPlatform
+
+from custom_components.noonlight2 import NoonlightIntegration
+from custom_components.noonlight2.const import (
+    ALARM_POLL_SCHEDULE,
+    CONF_API_ENDPOINT,
+    VERSION,
+)
+from custom_components.noonlight2.hub import NoonlightHub
+from custom_components.noonlight2.switch import NoonlightSwitch
+
+from .api_standin import NoonlightStandIn
+
+ROUNDS = int(os.environ.get("NOONLIGHT_BENCHMARK_ROUNDS", "20"))
+PACKAGE = "custom_components.noonlight2"
+
+
+def _summary(samples: list[float]) -> dict:
+    """Return the p50 and p99 of samples in seconds, in milliseconds."""
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "samples": len(samples),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+@pytest.fixture(scope="module")
+def results():
+    """Collect the results of this module and write them when asked to."""
+    collected = {}
+    yield collected
+    if path := os.environ.get("NOONLIGHT_BENCHMARK_OUTPUT"):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "integration_version": VERSION,
+                    "homeassistant": HA_VERSION,
+                    "python": platform.python_version(),
+                    "rounds": ROUNDS,
+                    "results": collected,
+                },
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+@pytest.fixture
+async def switch(hass: HomeAssistant, noonlight) -> NoonlightSwitch:
+    """Return the police switch of the integration, added to Home Assistant."""
+    entity = NoonlightSwitch(noonlight, "police", "Noonlight2 Switch", "mdi:police")
+    await MockEntityPlatform(hass).async_add_entities([entity])
+    return entity
+
+
+def _finish(noonlight) -> None:
+    """End the current alarm, as a canceled status callback would."""
+    noonlight.async_handle_status_update(
+        {"id": noonlight._alarm.id, "status": "CANCELED"}
+    )
+
+
+async def test_button_to_created(
+    hass: HomeAssistant, noonlight, noonlight_api, switch, results
+) -> None:
+    """Time from turning a switch on until the created alarm is shown."""
+    latency = []
+    loop_cpu = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        await switch.async_turn_on()
+        loop_cpu.append(time.thread_time() - cpu_start)
+        latency.append(time.perf_counter() - start)
+        assert hass.states.get(switch.entity_id).state == "on"
+        _finish(noonlight)
+
+    assert len(noonlight_api.created) == ROUNDS
+    results["button_to_created"] = _summary(latency)
+    # The stand-in runs on its own thread, so this is Home Assistant's share
+    results["loop_cpu_per_alarm"] = _summary(loop_cpu)
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory) -> tuple[str, str]:
+    """Return the paths of a self-signed certificate for 127.0.0.1 and its key."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.now(UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    directory = tmp_path_factory.mktemp("tls")
+    cert_path = directory / "cert.pem"
+    key_path = directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(cert_path), str(key_path)
+
+
+@pytest.fixture
+def noonlight_tls_api(socket_enabled, certificate):
+    """Return a stand-in serving HTTPS, trusted by the integration's transport."""
+    cert_path, key_path = certificate
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_context.load_cert_chain(cert_path, key_path)
+    api = NoonlightStandIn(server_context)
+    api.start()
+    with patch(
+        f"{PACKAGE}.transport.client_context",
+        lambda: ssl.create_default_context(cafile=cert_path),
+    ):
+        yield api
+    api.stop()
+
+
+async def test_cold_and_warm_create(
+    hass: HomeAssistant, noonlight_config, noonlight_tls_api, results
+) -> None:
+    """Alarm creation on a new TLS connection and on a pre-warmed one.
+
+    Every round starts a new integration, so nothing is pooled from the
+    previous round. The stand-in is addressed by IP, so DNS is not part
+    of the difference; TCP and the TLS handshake are.
+    """
+    config = {**noonlight_config, CONF_API_ENDPOINT: noonlight_tls_api.url}
+    cold = []
+    warm = []
+    for _ in range(ROUNDS):
+        for samples, warmed in ((cold, False), (warm, True)):
+            noonlight = NoonlightIntegration(
+                hass, config, {}, "benchmark", NoonlightHub(hass)
+            )
+            await noonlight.async_restore()
+            if warmed:
+                assert await noonlight.transport.async_warm()
+            start = time.perf_counter()
+            assert await noonlight.create_alarm(["police"]) is not None
+            samples.append(time.perf_counter() - start)
+            _finish(noonlight)
+            await noonlight.async_stop()
+
+    assert len(noonlight_tls_api.created) == 2 * ROUNDS
+    results["create_cold_connection"] = _summary(cold)
+    results["create_warm_connection"] = _summary(warm)
+
+
+async def test_status_propagation(
+    hass: HomeAssistant, noonlight, noonlight_api, switch, results
+) -> None:
+    """Time from a status callback until the switch shows the new status."""
+    latency = []
+    for _ in range(ROUNDS):
+        await switch.async_turn_on()
+        alarm_id = noonlight._alarm.id
+        start = time.perf_counter()
+        noonlight.async_handle_status_update({"id": alarm_id, "status": "CLOSED"})
+        latency.append(time.perf_counter() - start)
+        assert hass.states.get(switch.entity_id).state == "off"
+
+    results["status_callback_to_state"] = _summary(latency)
+    # Without callbacks a new status waits for the next poll of a new alarm
+    results["status_poll_interval_ms"] = ALARM_POLL_SCHEDULE[0][1] * 1000
+
+
+async def test_signal_to_state(
+    hass: HomeAssistant, noonlight, noonlight_api, switch, results
+) -> None:
+    """Time for a coordinator push to reach the switch state."""
+    await switch.async_turn_on()
+    alarm = noonlight._alarm
+    latency = []
+    for index in range(ROUNDS):
+        alarm.apply({"services": {"police": True, "fire": index % 2 == 0}})
+        start = time.perf_counter()
+        noonlight.coordinator.async_push()
+        latency.append(time.perf_counter() - start)
+        attributes = hass.states.get(switch.entity_id).attributes
+        assert ("fire" in attributes["alarm_services"]) == (index % 2 == 0)
+
+    results["signal_to_state"] = _summary(latency)
+
+
+def test_integration_import(results) -> None:
+    """Time spent importing the integration's own modules.
+
+    Home Assistant modules are excluded: they are loaded anyway.
+    """
+    command = [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"]
+    samples = []
+    for _ in range(min(ROUNDS, 5)):
+        stderr = subprocess.run(
+            command,
+            capture_output=True,
+            check=True,
+            cwd=os.path.dirname(os.path.dirname(__file__)),
+            text=True,
+        ).stderr
+        seconds = 0.0
+        # import time: self [us] | cumulative | imported package
+        for line in stderr.splitlines():
+            own, _, module = line.split("|")
+            if module.strip().startswith(PACKAGE):
+                seconds += int(own.split(":")[1]) / 1e6
+        samples.append(seconds)
+
+    results["integration_import"] = _summary(samples)
@@ -0,0 +1,106 @@
+"""Tests for the alarm countdown."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import homeassistant.util.dt as dt_util
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.noonlight2.const import (
+    CONST_NOONLIGHT_HA_SERVICE_CANCEL_COUNTDOWN,
+    DOMAIN,
+)
+
+PANEL = "alarm_control_panel.home"
+SECONDS = 30
+
+
+async def _advance(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+async def test_alarm_is_sent_at_the_deadline(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """The alarm goes out when the countdown ends, not before."""
+    noonlight.countdown.start({"police": True}, SECONDS, "Front door")
+    await hass.async_block_till_done()
+
+    await _advance(hass, SECONDS - 1)
+    assert noonlight_api.created == []
+    assert noonlight.countdown.active
+
+    await _advance(hass, SECONDS + 1)
+    assert len(noonlight_api.created) == 1
+    assert noonlight_api.created[0]["services"] == {"police": True}
+    assert noonlight_api.created[0]["instructions"] == {"entry": "Front door"}
+    assert not noonlight.countdown.active
+
+
+async def test_guard_cancels_the_countdown(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """The countdown ends without an alarm when its guard leaves its state."""
+    hass.states.async_set(PANEL, "armed_away")
+    noonlight.countdown.start({"police": True}, SECONDS, None, PANEL, "armed_away")
+    await hass.async_block_till_done()
+
+    hass.states.async_set(PANEL, "disarmed")
+    await hass.async_block_till_done()
+    assert not noonlight.countdown.active
+
+    await _advance(hass, SECONDS + 1)
+    assert noonlight_api.created == []
+
+
+async def test_pin_cancels_the_countdown(
+    hass: HomeAssistant, config_entry, noonlight_api
+) -> None:
+    """Only the right PIN cancels the countdown."""
+    countdown = hass.data[DOMAIN][config_entry.entry_id].countdown
+    countdown.start({"police": True}, SECONDS)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            CONST_NOONLIGHT_HA_SERVICE_CANCEL_COUNTDOWN,
+            {"pin": "0000"},
+            blocking=True,
+            return_response=True,
+        )
+    assert countdown.active
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        CONST_NOONLIGHT_HA_SERVICE_CANCEL_COUNTDOWN,
+        {"pin": "1234"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"canceled": True}
+    assert not countdown.active
+
+    await _advance(hass, SECONDS + 1)
+    assert noonlight_api.created == []
+
+
+async def test_prepared_body_is_sent(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """The body built while counting down is sent as is at the deadline."""
+    noonlight.countdown.start({"police": True}, SECONDS, "Front door")
+    await hass.async_block_till_done()
+    _, prepared = noonlight._prepared_body
+
+    with patch.object(
+        noonlight._delivery, "async_send", wraps=noonlight._delivery.async_send
+    ) as async_send:
+        await _advance(hass, SECONDS + 1)
+
+    assert async_send.call_args[0][0] is prepared
+    assert len(noonlight_api.created) == 1
@@ -0,0 +1,154 @@
+"""Tests for the alarm delivery engine."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.noonlight2.api import EndpointUnreachable, NoonlightApiError
+from custom_components.noonlight2.delivery import AlarmDelivery, AlarmDeliveryError
+
+
+class ScriptedClient:
+    """API client whose `POST /alarms` attempts run scripted coroutines."""
+
+    def __init__(self, *attempts) -> None:
+        """Initialize the client with one coroutine function per attempt."""
+        self.headers = {"Authorization": "Bearer test-token"}
+        self.metrics = Mock()
+        self.keys = []
+        self._attempts = list(attempts)
+
+    async def async_create_alarm(self, body, headers, timeout):
+        self.keys.append(headers["Idempotency-Key"])
+        return await self._attempts.pop(0)()
+
+
+def respond(alarm_id, delay=0.0, event=None):
+    """Return an attempt that creates `alarm_id` after a delay or event."""
+
+    async def _attempt():
+        if event is not None:
+            await event.wait()
+        await asyncio.sleep(delay)
+        return {"id": alarm_id, "status": "ACTIVE"}
+
+    return _attempt
+
+
+def fail(status):
+    """Return an attempt that fails with an HTTP status, or no response."""
+
+    async def _attempt():
+        raise NoonlightApiError("stand-in failure", status=status)
+
+    return _attempt
+
+
+async def unreachable():
+    """Fail an attempt before the request was sent."""
+    raise EndpointUnreachable("stand-in connection refused")
+
+
+async def test_retries_keep_the_idempotency_key() -> None:
+    """Retryable failures are retried with the caller's key."""
+    client = ScriptedClient(fail(503), unreachable, respond("alarm-1"))
+    delivery = AlarmDelivery(client, hedge_delay=None)
+
+    alarm = await delivery.async_send(b"{}", "intent-1")
+
+    assert alarm["id"] == "alarm-1"
+    assert client.keys == ["intent-1"] * 3
+    assert client.metrics.record_retry.call_count == 2
+
+
+async def test_generates_a_key_per_alarm() -> None:
+    """Without a key every attempt of one alarm still shares one."""
+    client = ScriptedClient(fail(502), respond("alarm-1"))
+    delivery = AlarmDelivery(client, hedge_delay=None)
+
+    await delivery.async_send(b"{}")
+
+    assert len(client.keys) == 2
+    assert client.keys[0] == client.keys[1]
+
+
+async def test_client_errors_are_not_retried() -> None:
+    """A refused request fails at once."""
+    client = ScriptedClient(fail(400), respond("alarm-1"))
+    delivery = AlarmDelivery(client, hedge_delay=None)
+
+    with pytest.raises(AlarmDeliveryError) as err:
+        await delivery.async_send(b"{}")
+    assert not err.value.retryable
+    assert len(client.keys) == 1
+
+
+async def test_timeout_after_send_is_not_retried() -> None:
+    """A request that went out without an answer may have created the alarm."""
+    client = ScriptedClient(fail(None), respond("alarm-1"))
+    delivery = AlarmDelivery(client, hedge_delay=None)
+
+    with pytest.raises(AlarmDeliveryError, match="may have been created") as err:
+        await delivery.async_send(b"{}")
+    assert not err.value.retryable
+    assert len(client.keys) == 1
+
+
+async def test_gives_up_at_the_deadline() -> None:
+    """Failures stop being retried once the deadline has passed."""
+    client = ScriptedClient(*(fail(503) for _ in range(20)))
+    delivery = AlarmDelivery(client, deadline=0.5, hedge_delay=None)
+
+    with pytest.raises(AlarmDeliveryError, match="Not delivered within 0.5s") as err:
+        await delivery.async_send(b"{}")
+    assert err.value.retryable
+    assert len(client.keys) < 20
+
+
+async def test_hedged_duplicate_is_reported() -> None:
+    """A slow first attempt that also creates an alarm is reaped."""
+    on_duplicate = Mock()
+    client = ScriptedClient(respond("alarm-1", delay=0.2), respond("alarm-2"))
+    delivery = AlarmDelivery(client, on_duplicate=on_duplicate, hedge_delay=0.05)
+
+    alarm = await delivery.async_send(b"{}", "intent-1")
+    assert alarm["id"] == "alarm-2"
+    assert client.keys == ["intent-1", "intent-1"]
+
+    await asyncio.sleep(0.3)
+    on_duplicate.assert_called_once()
+    assert on_duplicate.call_args[0][0]["id"] == "alarm-1"
+
+
+async def test_hedged_attempts_finishing_together_are_reaped() -> None:
+    """Both attempts completing in one wakeup still reports the duplicate."""
+    on_duplicate = Mock()
+    release = asyncio.Event()
+    client = ScriptedClient(
+        respond("alarm-1", event=release), respond("alarm-2", event=release)
+    )
+    delivery = AlarmDelivery(client, on_duplicate=on_duplicate, hedge_delay=0.05)
+
+    send = asyncio.ensure_future(delivery.async_send(b"{}"))
+    await asyncio.sleep(0.1)
+    assert len(client.keys) == 2
+    release.set()
+    alarm = await send
+    await asyncio.sleep(0)
+
+    on_duplicate.assert_called_once()
+    duplicate = on_duplicate.call_args[0][0]
+    assert {alarm["id"], duplicate["id"]} == {"alarm-1", "alarm-2"}
+
+
+async def test_hedged_same_alarm_is_not_a_duplicate() -> None:
+    """An attempt answered with the same alarm is not canceled."""
+    on_duplicate = Mock()
+    client = ScriptedClient(respond("alarm-1", delay=0.2), respond("alarm-1"))
+    delivery = AlarmDelivery(client, on_duplicate=on_duplicate, hedge_delay=0.05)
+
+    await delivery.async_send(b"{}")
+    await asyncio.sleep(0.3)
+
+    on_duplicate.assert_not_called()
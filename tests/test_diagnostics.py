@@ -0,0 +1,48 @@
+"""Tests for the config entry diagnostics."""
+
+import json
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.noonlight2.const import (
+    CONF_PHONE_NUMBER,
+    CONF_PIN,
+    CONF_SERVER_TOKEN,
+    DOMAIN,
+)
+from custom_components.noonlight2.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+TOKEN = "secret-server-token"
+PIN = "pin-2468"
+PHONE = "15550109876"
+WEBHOOK_ID = "test-webhook-id"
+
+
+@pytest.fixture
+def noonlight_config(noonlight_config) -> dict:
+    """Use secrets that cannot appear in the output by chance."""
+    return {
+        **noonlight_config,
+        CONF_SERVER_TOKEN: TOKEN,
+        CONF_PIN: PIN,
+        CONF_PHONE_NUMBER: PHONE,
+    }
+
+
+async def test_secrets_are_redacted(
+    hass: HomeAssistant, config_entry, noonlight_api
+) -> None:
+    """Token, PIN, phone number and webhook id never appear."""
+    noonlight = hass.data[DOMAIN][config_entry.entry_id]
+    alarm = await noonlight.create_alarm(["police"], "Front door")
+    await noonlight.api.async_cancel_alarm(alarm.id, noonlight.pin)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    output = json.dumps(diagnostics, default=str)
+
+    assert diagnostics["exchanges"]
+    for secret in (TOKEN, PIN, PHONE, WEBHOOK_ID):
+        assert secret not in output
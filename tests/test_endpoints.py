@@ -0,0 +1,118 @@
+"""Tests for endpoint health tracking and failover."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import homeassistant.util.dt as dt_util
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.noonlight2.const import (
+    ENDPOINT_FAILURE_THRESHOLD,
+    ENDPOINT_OPEN_MIN_DURATION,
+)
+from custom_components.noonlight2.endpoints import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    EndpointPool,
+    parse_endpoints,
+)
+
+PRIMARY = "https://primary.example"
+SECONDARY = "https://secondary.example"
+
+
+@pytest.fixture
+def async_probe() -> AsyncMock:
+    """Return a probe that fails until told otherwise."""
+    return AsyncMock(return_value=False)
+
+
+@pytest.fixture
+def pool(hass: HomeAssistant, async_probe):
+    """Return a pool of two endpoints."""
+    pool = EndpointPool(hass, (PRIMARY, SECONDARY), async_probe)
+    yield pool
+    pool.stop()
+
+
+def _fail(pool: EndpointPool, url: str) -> None:
+    for _ in range(ENDPOINT_FAILURE_THRESHOLD):
+        pool.record_failure(url, 1.0)
+
+
+async def _wait(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+def test_parse_endpoints() -> None:
+    """The setting is split on commas, keeping the configured order."""
+    assert parse_endpoints(f" {PRIMARY}, ,{SECONDARY} ") == (PRIMARY, SECONDARY)
+
+
+async def test_ranking(hass: HomeAssistant, pool) -> None:
+    """Endpoints are tried in configured order, then by latency and errors."""
+    assert pool.ranked() == [PRIMARY, SECONDARY]
+
+    pool.record_success(PRIMARY, 0.5)
+    pool.record_success(SECONDARY, 0.1)
+    # Ranked again, behind the endpoint without slow failures
+    assert pool.ranked() == [SECONDARY, PRIMARY]
+
+    # One failure in two costs more than the latency difference
+    pool.record_failure(SECONDARY, 0.1)
+    assert pool.ranked() == [PRIMARY, SECONDARY]
+
+
+async def test_circuit_opens_after_failures(hass: HomeAssistant, pool) -> None:
+    """An endpoint failing repeatedly is skipped until it recovers."""
+    pool.record_failure(PRIMARY)
+    assert pool.endpoints[PRIMARY].state == CIRCUIT_CLOSED
+
+    _fail(pool, PRIMARY)
+
+    assert pool.endpoints[PRIMARY].state == CIRCUIT_OPEN
+    assert pool.ranked() == [SECONDARY]
+
+
+async def test_all_open_still_tried(hass: HomeAssistant, pool) -> None:
+    """With every circuit open the endpoints are still tried in order."""
+    _fail(pool, PRIMARY)
+    _fail(pool, SECONDARY)
+
+    assert pool.ranked() == [PRIMARY, SECONDARY]
+
+
+async def test_half_open_probe(hass: HomeAssistant, pool, async_probe) -> None:
+    """A failed probe reopens for longer, a successful one closes."""
+    _fail(pool, PRIMARY)
+
+    await _wait(hass, ENDPOINT_OPEN_MIN_DURATION)
+    async_probe.assert_awaited_once_with(PRIMARY)
+    health = pool.endpoints[PRIMARY]
+    assert health.state == CIRCUIT_OPEN
+    assert health.open_duration == 2 * ENDPOINT_OPEN_MIN_DURATION
+
+    async_probe.return_value = True
+    await _wait(hass, 2 * ENDPOINT_OPEN_MIN_DURATION)
+    assert async_probe.await_count == 2
+    assert health.state == CIRCUIT_CLOSED
+    assert health.open_duration == ENDPOINT_OPEN_MIN_DURATION
+    assert health.consecutive_failures == 0
+    # Ranked again, behind the endpoint without slow failures
+    assert pool.ranked() == [SECONDARY, PRIMARY]
+
+
+async def test_request_closes_open_circuit(
+    hass: HomeAssistant, pool, async_probe
+) -> None:
+    """A response from an open endpoint closes it and cancels its probe."""
+    _fail(pool, PRIMARY)
+
+    pool.record_success(PRIMARY, 0.1)
+    await _wait(hass, ENDPOINT_OPEN_MIN_DURATION)
+
+    assert pool.endpoints[PRIMARY].state == CIRCUIT_CLOSED
+    async_probe.assert_not_awaited()
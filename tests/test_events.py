@@ -0,0 +1,97 @@
+"""Tests for forwarding entity state changes as alarm events."""
+
+import asyncio
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.noonlight2.const import (
+    CONF_EVENT_ENTITIES,
+    EVENT_COALESCE_WINDOW,
+    EVENT_MAX_IN_FLIGHT,
+)
+
+DOOR = "binary_sensor.front_door"
+FLAPS = 50
+
+
+@pytest.fixture
+def noonlight_options() -> dict:
+    """Forward the front door."""
+    return {CONF_EVENT_ENTITIES: [DOOR]}
+
+
+def _set(hass: HomeAssistant, state: str) -> None:
+    hass.states.async_set(DOOR, state, {"device_class": "door"})
+
+
+async def _end_window(hass: HomeAssistant) -> None:
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=EVENT_COALESCE_WINDOW)
+    )
+    await hass.async_block_till_done()
+
+
+def _sent_values(noonlight_api) -> list[str]:
+    """Return the values sent, in the order they changed."""
+    events = [
+        event for batch in noonlight_api.posted.get("events", []) for event in batch
+    ]
+    # Batches in flight together may reach the API in either order
+    events.sort(key=lambda event: event["event_time"])
+    return [event["meta"]["value"] for event in events]
+
+
+async def test_flapping_is_coalesced(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """Changes inside one window are sent once and repeats are dropped."""
+    _set(hass, "off")
+    await noonlight.create_alarm(["police"])
+
+    for index in range(FLAPS):
+        _set(hass, "on" if index % 2 else "off")
+    await _end_window(hass)
+    assert _sent_values(noonlight_api) == ["open"]
+
+    # Flapping back to the value last sent sends nothing
+    for index in range(FLAPS):
+        _set(hass, "on" if index % 2 else "off")
+    await _end_window(hass)
+    assert _sent_values(noonlight_api) == ["open"]
+
+    _set(hass, "off")
+    await _end_window(hass)
+    assert _sent_values(noonlight_api) == ["open", "closed"]
+
+
+async def test_in_flight_submissions_are_capped(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """A slow API never has more than the allowed batches in flight."""
+    _set(hass, "off")
+    await noonlight.create_alarm(["police"])
+    noonlight_api.post_latency = 0.2
+
+    for index in range(FLAPS):
+        _set(hass, "off" if index % 2 else "on")
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=EVENT_COALESCE_WINDOW)
+        )
+        await asyncio.sleep(0.02)
+
+    forwarder = noonlight.event_forwarder
+    async with asyncio.timeout(10):
+        while forwarder._pending or forwarder._in_flight:
+            await _end_window(hass)
+
+    values = _sent_values(noonlight_api)
+    assert noonlight_api.max_in_flight == EVENT_MAX_IN_FLIGHT
+    assert len(noonlight_api.posted["events"]) < FLAPS
+    # No value is sent twice in a row, and the last one is the final state
+    assert all(a != b for a, b in zip(values, values[1:]))
+    assert values[-1] == "closed"
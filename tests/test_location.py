@@ -0,0 +1,94 @@
+"""Tests for streaming the tracked location to an active alarm."""
+
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.noonlight2.const import (
+    CONF_LOCATION_ENTITY,
+    LOCATION_MIN_INTERVAL,
+)
+
+PHONE = "device_tracker.phone"
+LATITUDE = 38.6270
+LONGITUDE = -90.1994
+# About 110 m north, well past LOCATION_MIN_DISTANCE
+STEP = 0.001
+MOVES = 20
+
+
+@pytest.fixture
+def noonlight_options() -> dict:
+    """Track the phone."""
+    return {CONF_LOCATION_ENTITY: PHONE}
+
+
+def _move(hass: HomeAssistant, latitude: float) -> None:
+    hass.states.async_set(
+        PHONE,
+        "not_home",
+        {"latitude": latitude, "longitude": LONGITUDE, "gps_accuracy": 10},
+    )
+
+
+async def _end_interval(hass: HomeAssistant) -> None:
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=LOCATION_MIN_INTERVAL)
+    )
+    await hass.async_block_till_done()
+
+
+def _sent_latitudes(noonlight_api) -> list[float]:
+    return [
+        body["coordinates"]["lat"] for body in noonlight_api.posted.get("locations", [])
+    ]
+
+
+async def test_one_update_per_interval(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """Rapid moves send the latest position once per interval."""
+    _move(hass, LATITUDE)
+    alarm = await noonlight.create_alarm(["police"])
+
+    for index in range(1, MOVES + 1):
+        _move(hass, LATITUDE + index * STEP)
+    await hass.async_block_till_done()
+    assert _sent_latitudes(noonlight_api) == []
+
+    await _end_interval(hass)
+    assert _sent_latitudes(noonlight_api) == [LATITUDE + MOVES * STEP]
+
+    for index in range(MOVES + 1, 2 * MOVES + 1):
+        _move(hass, LATITUDE + index * STEP)
+    await _end_interval(hass)
+
+    assert _sent_latitudes(noonlight_api) == [
+        LATITUDE + MOVES * STEP,
+        LATITUDE + 2 * MOVES * STEP,
+    ]
+    assert noonlight_api.requests.count(
+        ("POST", f"/alarms/{alarm.id}/locations")
+    ) == 2
+    assert noonlight.location_updater.update_count == 2
+
+
+async def test_unchanged_position_is_not_sent(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """Reports of the position the alarm already has send nothing."""
+    _move(hass, LATITUDE)
+    await noonlight.create_alarm(["police"])
+
+    for index in range(MOVES):
+        # GPS jitter of a few meters
+        _move(hass, LATITUDE + (index % 2) * STEP / 100)
+    await _end_interval(hass)
+    await _end_interval(hass)
+
+    assert _sent_latitudes(noonlight_api) == []
+    assert noonlight.location_updater.update_count == 0
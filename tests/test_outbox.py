@@ -0,0 +1,116 @@
+"""Tests for retrying unsent alarms from the outbox."""
+
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.noonlight2 import NoonlightIntegration, async_remove_entry
+from custom_components.noonlight2.const import DOMAIN, OUTBOX_RETRY_INTERVAL
+from custom_components.noonlight2.hub import NoonlightHub
+
+
+async def _send_while_unavailable(noonlight, noonlight_api):
+    """Request an alarm while the stand-in refuses to create it."""
+    noonlight._delivery.deadline = 0.2
+    noonlight_api.create_failures = [503] * 10
+
+    alarm, _ = await noonlight.async_request_alarm(["police"])
+
+    assert alarm is None
+    assert len(noonlight.outbox.intents) == 1
+    noonlight_api.create_failures = []
+    return next(iter(noonlight.outbox.intents))
+
+
+async def test_outbox_retry_reuses_the_intent_key(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """A background retry resends the alarm with the same key."""
+    intent_id = await _send_while_unavailable(noonlight, noonlight_api)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + OUTBOX_RETRY_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert set(noonlight_api.create_keys) == {intent_id}
+    assert len(noonlight_api.created) == 1
+    assert noonlight._alarm.id == noonlight_api.created[0]["id"]
+    assert noonlight.outbox.intents == {}
+    assert noonlight._alarm.id in noonlight.outbox.alarms
+
+
+async def test_outbox_retry_after_restart(
+    hass: HomeAssistant, noonlight, noonlight_api, noonlight_config
+) -> None:
+    """An intent saved before a restart is resent with the same key."""
+    intent_id = await _send_while_unavailable(noonlight, noonlight_api)
+    await noonlight.async_stop()
+
+    restarted = NoonlightIntegration(
+        hass, noonlight_config, {}, "test_entry", NoonlightHub(hass)
+    )
+    await restarted.async_restore()
+    assert intent_id in restarted.outbox.intents
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await hass.async_block_till_done()
+
+    assert set(noonlight_api.create_keys) == {intent_id}
+    assert len(noonlight_api.created) == 1
+    assert restarted._alarm.id == noonlight_api.created[0]["id"]
+    await restarted.async_stop()
+
+
+async def test_refused_alarm_is_not_retried(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """An alarm the API rejects as invalid is dropped instead of retried."""
+    noonlight_api.create_failures = [422]
+
+    alarm, _ = await noonlight.async_request_alarm(["police"])
+    async_fire_time_changed(hass, dt_util.utcnow() + OUTBOX_RETRY_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert alarm is None
+    assert noonlight.outbox.intents == {}
+    assert noonlight_api.requests.count(("POST", "/alarms")) == 1
+
+
+async def test_remove_entry_deletes_outbox(
+    hass: HomeAssistant, noonlight, noonlight_api, hass_storage: dict[str, Any]
+) -> None:
+    """Removing the config entry deletes its stored outbox."""
+    await noonlight.create_alarm(["police"])
+    await noonlight.outbox.async_flush()
+    key = f"{DOMAIN}.test_entry.outbox"
+    assert key in hass_storage
+
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="test_entry")
+    await async_remove_entry(hass, entry)
+
+    assert key not in hass_storage
+
+
+async def test_lost_response_is_not_resent(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """An alarm whose response timed out is not sent again.
+
+    The stand-in, like the API, does not de-duplicate by key, so a resend
+    would dispatch a second alarm.
+    """
+    noonlight._delivery.attempt_timeout = 0.2
+    noonlight_api.create_latencies = [1]
+
+    alarm, _ = await noonlight.async_request_alarm(["police"])
+    async_fire_time_changed(hass, dt_util.utcnow() + OUTBOX_RETRY_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert alarm is None
+    assert noonlight.outbox.intents == {}
+    assert noonlight_api.requests.count(("POST", "/alarms")) == 1
+    # The alarm exists at Noonlight but is not tracked
+    assert len(noonlight_api.created) == 1
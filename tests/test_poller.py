@@ -0,0 +1,118 @@
+"""Tests for alarm status polling."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.noonlight2.poller import (
+    AlarmPollSettings,
+    AlarmStatusPoller,
+    StatusPollError,
+)
+
+
+def _settings(async_poll, min_interval=None) -> AlarmPollSettings:
+    return AlarmPollSettings(async_poll, timedelta(hours=1), min_interval)
+
+
+def _next_poll_in(poller: AlarmStatusPoller, alarm_id: str) -> float:
+    return poller.as_dict()["alarms"][alarm_id]["next_poll_in"]
+
+
+@pytest.fixture
+def fast_polls():
+    """Poll every 0.1s; the poller schedules by the loop's clock."""
+    with patch(
+        "custom_components.noonlight2.poller.ALARM_POLL_SCHEDULE",
+        ((timedelta(minutes=1), 0.1),),
+    ):
+        yield
+
+
+async def _wait_for_poll(async_poll: AsyncMock) -> None:
+    async with asyncio.timeout(2):
+        while not async_poll.await_count:
+            await asyncio.sleep(0.01)
+
+
+async def test_fallback_floor_waits_for_callbacks(hass: HomeAssistant) -> None:
+    """Polling only slows to the fallback once callbacks are confirmed."""
+    poller = AlarmStatusPoller(hass)
+    settings = _settings(AsyncMock(), min_interval=timedelta(minutes=2))
+
+    poller.track("alarm-1", settings)
+    assert _next_poll_in(poller, "alarm-1") == 2
+
+    settings.push_confirmed = True
+    poller.track("alarm-2", settings)
+    assert _next_poll_in(poller, "alarm-2") == 120
+    poller.stop()
+
+
+@pytest.mark.parametrize(
+    "error", [StatusPollError("stand-in failure"), RuntimeError("bug")]
+)
+async def test_failed_poll_backs_off(
+    hass: HomeAssistant, fast_polls, error
+) -> None:
+    """Any failure moves the next poll forward instead of repeating it."""
+    async_poll = AsyncMock(side_effect=error)
+    poller = AlarmStatusPoller(hass)
+    poller.track("alarm-1", _settings(async_poll))
+
+    await _wait_for_poll(async_poll)
+    await hass.async_block_till_done()
+
+    async_poll.assert_awaited_once_with("alarm-1")
+    assert poller.as_dict()["alarms"]["alarm-1"]["error_count"] == 1
+    # Twice the 0.1s interval after one failure
+    assert _next_poll_in(poller, "alarm-1") >= 0.1
+    poller.stop()
+
+
+async def test_terminal_status_stops_polling(
+    hass: HomeAssistant, fast_polls
+) -> None:
+    """An alarm is no longer polled once it is canceled."""
+    async_poll = AsyncMock(return_value="CANCELED")
+    poller = AlarmStatusPoller(hass)
+    poller.track("alarm-1", _settings(async_poll))
+
+    await _wait_for_poll(async_poll)
+    await hass.async_block_till_done()
+
+    assert not poller.active
+
+
+async def test_status_update(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """A poll applies the status returned by the API."""
+    alarm = await noonlight.create_alarm(["police"])
+    noonlight_api.alarms[alarm.id]["status"] = "CANCELED"
+
+    assert await noonlight.update_alarm_status() == "CANCELED"
+    assert noonlight._alarm is None
+    assert alarm.id not in noonlight.outbox.alarms
+
+
+@pytest.mark.parametrize(
+    ("body", "content_type"),
+    [
+        ([], "application/json"),
+        ("<html>Bad gateway</html>", "text/html"),
+        ("{", "application/json"),
+    ],
+)
+async def test_unexpected_status_response(
+    hass: HomeAssistant, noonlight, noonlight_api, body, content_type
+) -> None:
+    """A status response that is not a JSON object is a failed poll."""
+    await noonlight.create_alarm(["police"])
+    noonlight_api.status_body = body
+    noonlight_api.status_content_type = content_type
+
+    with pytest.raises(StatusPollError):
+        await noonlight.update_alarm_status()
+    assert noonlight._alarm.status == "ACTIVE"
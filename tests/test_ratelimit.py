@@ -0,0 +1,90 @@
+"""Tests for the request rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.noonlight2.const import (
+    RATE_LIMIT_MIN_RATE,
+    RATE_LIMIT_RECOVERY,
+)
+from custom_components.noonlight2.ratelimit import (
+    PRIORITY_ALARM,
+    PRIORITY_STATUS,
+    PRIORITY_TELEMETRY,
+    RateLimiter,
+    RateLimitExceeded,
+)
+
+RATE = 100
+BURST = 10
+
+
+@pytest.fixture
+def limiter() -> RateLimiter:
+    """Return a fast limiter so waits stay short."""
+    return RateLimiter(time.monotonic, rate=RATE, burst=BURST)
+
+
+async def test_alarms_never_wait(limiter: RateLimiter) -> None:
+    """Alarm requests go out at once, borrowing up to one burst."""
+    start = time.monotonic()
+    for _ in range(3 * BURST):
+        await limiter.async_acquire(PRIORITY_ALARM)
+
+    assert time.monotonic() - start < 0.05
+    assert limiter.as_dict()["tokens"] < -BURST + 1
+
+
+async def test_alarm_debt_delays_deferrable_requests(limiter: RateLimiter) -> None:
+    """After alarms, status requests wait for the debt to be repaid."""
+    for _ in range(2 * BURST):
+        await limiter.async_acquire(PRIORITY_ALARM)
+
+    start = time.monotonic()
+    await limiter.async_acquire(PRIORITY_STATUS)
+
+    # At least the borrowed burst has to be earned back first
+    assert time.monotonic() - start >= BURST / RATE
+
+
+async def test_higher_priority_goes_first(limiter: RateLimiter) -> None:
+    """Waiting status requests are let through before telemetry."""
+    for _ in range(2 * BURST):
+        await limiter.async_acquire(PRIORITY_ALARM)
+    order = []
+
+    async def _acquire(priority: int) -> None:
+        await limiter.async_acquire(priority)
+        order.append(priority)
+
+    await asyncio.gather(_acquire(PRIORITY_TELEMETRY), _acquire(PRIORITY_STATUS))
+
+    assert order == [PRIORITY_STATUS, PRIORITY_TELEMETRY]
+
+
+async def test_throttled_requests_are_deferred(limiter: RateLimiter) -> None:
+    """After a 429 deferrable requests raise instead of waiting too long."""
+    limiter.record_throttled(60)
+
+    with pytest.raises(RateLimitExceeded) as err:
+        await limiter.async_acquire(PRIORITY_STATUS)
+    assert 59 < err.value.retry_after <= 60
+    with pytest.raises(RateLimitExceeded):
+        await limiter.async_acquire(PRIORITY_TELEMETRY)
+    # Alarms still go out
+    await limiter.async_acquire(PRIORITY_ALARM)
+
+
+def test_throttling_halves_the_rate(limiter: RateLimiter) -> None:
+    """Each 429 halves the rate and each success recovers a little."""
+    limiter.record_throttled(None)
+    assert limiter.rate == RATE / 2
+
+    limiter.record_success()
+    assert limiter.rate == RATE / 2 + RATE_LIMIT_RECOVERY
+
+    for _ in range(20):
+        limiter.record_throttled(None)
+    assert limiter.rate == RATE_LIMIT_MIN_RATE
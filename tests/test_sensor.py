@@ -0,0 +1,33 @@
+"""Tests for the metrics sensors."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.noonlight2.api import NoonlightApiError
+from custom_components.noonlight2.const import DOMAIN
+
+LATENCY = "sensor.noonlight2_alarm_create_latency"
+POLL_ERROR_RATE = "sensor.noonlight2_status_poll_error_rate"
+
+
+async def test_metrics_sensors_are_pushed(
+    hass: HomeAssistant, config_entry, noonlight_api
+) -> None:
+    """Latency and poll error rate update without being polled."""
+    noonlight = hass.data[DOMAIN][config_entry.entry_id]
+    assert hass.states.get(LATENCY).state == "unknown"
+    assert hass.states.get(POLL_ERROR_RATE).state == "unknown"
+
+    alarm = await noonlight.create_alarm(["police"])
+    await hass.async_block_till_done()
+    assert float(hass.states.get(LATENCY).state) > 0
+
+    await noonlight.api.async_get_alarm_status(alarm.id)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(POLL_ERROR_RATE).state) == 0
+
+    noonlight_api.status_failures = [400]
+    with pytest.raises(NoonlightApiError):
+        await noonlight.api.async_get_alarm_status(alarm.id)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(POLL_ERROR_RATE).state) == 50
@@ -0,0 +1,153 @@
+"""Tests for trigger rules."""
+
+import pytest
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import CoreState, HomeAssistant
+
+from custom_components.noonlight2.const import (
+    CONF_RULE_CONDITION_ENTITY,
+    CONF_RULE_CONDITION_STATE,
+    CONF_RULE_ENTITY,
+    CONF_RULE_SERVICE,
+    CONF_RULE_STATE,
+    CONF_TRIGGER_RULES,
+)
+
+SMOKE = "binary_sensor.kitchen_smoke"
+DOOR = "binary_sensor.front_door"
+PANEL = "alarm_control_panel.home"
+
+
+@pytest.fixture
+def noonlight_options() -> dict:
+    """Configure one plain and one conditional rule."""
+    return {
+        CONF_TRIGGER_RULES: [
+            {
+                CONF_RULE_ENTITY: SMOKE,
+                CONF_RULE_STATE: "on",
+                CONF_RULE_SERVICE: "fire",
+            },
+            {
+                CONF_RULE_ENTITY: DOOR,
+                CONF_RULE_STATE: "on",
+                CONF_RULE_SERVICE: "police",
+                CONF_RULE_CONDITION_ENTITY: PANEL,
+                CONF_RULE_CONDITION_STATE: "armed_away",
+            },
+        ]
+    }
+
+
+async def _set(hass: HomeAssistant, entity_id: str, state: str) -> None:
+    hass.states.async_set(entity_id, state)
+    await hass.async_block_till_done()
+
+
+async def test_rule_fires_on_transition(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """A change to the rule's state requests the alarm."""
+    await _set(hass, SMOKE, "off")
+    noonlight.triggers.start()
+
+    await _set(hass, SMOKE, "on")
+
+    assert len(noonlight_api.created) == 1
+    alarm = noonlight_api.created[0]
+    assert alarm["services"] == {"fire": True}
+    assert alarm["instructions"] == {"entry": f"Triggered by {SMOKE}"}
+
+
+async def test_first_state_does_not_fire(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """An entity appearing in the rule's state is not a transition."""
+    noonlight.triggers.start()
+
+    await _set(hass, SMOKE, "on")
+
+    assert noonlight_api.created == []
+
+
+@pytest.mark.parametrize("old_state", [STATE_UNAVAILABLE, STATE_UNKNOWN])
+async def test_recovering_entity_does_not_fire(
+    hass: HomeAssistant, noonlight, noonlight_api, old_state
+) -> None:
+    """An entity coming back online in the rule's state is ignored."""
+    await _set(hass, SMOKE, old_state)
+    noonlight.triggers.start()
+
+    await _set(hass, SMOKE, "on")
+    assert noonlight_api.created == []
+
+    await _set(hass, SMOKE, "off")
+    await _set(hass, SMOKE, "on")
+    assert len(noonlight_api.created) == 1
+
+
+async def test_rules_wait_for_startup(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """States restored while Home Assistant starts do not fire rules."""
+    hass.set_state(CoreState.starting)
+    noonlight.triggers.start()
+
+    await _set(hass, SMOKE, "off")
+    await _set(hass, SMOKE, "on")
+    assert noonlight_api.created == []
+
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    await _set(hass, SMOKE, "off")
+    await _set(hass, SMOKE, "on")
+    assert len(noonlight_api.created) == 1
+
+
+async def test_condition(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """A conditional rule only fires while its condition holds."""
+    await _set(hass, PANEL, "disarmed")
+    await _set(hass, DOOR, "off")
+    noonlight.triggers.start()
+
+    await _set(hass, DOOR, "on")
+    assert noonlight_api.created == []
+
+    await _set(hass, PANEL, "armed_away")
+    await _set(hass, DOOR, "off")
+    await _set(hass, DOOR, "on")
+    assert len(noonlight_api.created) == 1
+    assert noonlight_api.created[0]["services"] == {"police": True}
+
+
+async def test_stop(hass: HomeAssistant, noonlight, noonlight_api) -> None:
+    """Stopped rules no longer fire."""
+    await _set(hass, SMOKE, "off")
+    noonlight.triggers.start()
+    noonlight.triggers.stop()
+
+    await _set(hass, SMOKE, "on")
+
+    assert noonlight_api.created == []
+
+
+async def test_repeated_rule_sends_instruction_once(
+    hass: HomeAssistant, noonlight, noonlight_api
+) -> None:
+    """A flapping rule adds its service and instruction to the alarm once."""
+    alarm = await noonlight.create_alarm(["police"])
+    await _set(hass, SMOKE, "off")
+    noonlight.triggers.start()
+
+    for _ in range(2):
+        await _set(hass, SMOKE, "on")
+        await _set(hass, SMOKE, "off")
+
+    assert noonlight_api.requests.count(("PATCH", f"/alarms/{alarm.id}")) == 1
+    assert alarm.services == {"police": True, "fire": True}
+    assert alarm.instructions == {f"Triggered by {SMOKE}"}
@@ -0,0 +1,93 @@
+"""Tests for the Noonlight status webhook."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.noonlight2.const import DOMAIN
+
+from .api_standin import STATUS_CANCELED
+
+WEBHOOK_URL = "/api/webhook/test-webhook-id"
+
+
+@pytest.fixture
+async def webhook_client(hass: HomeAssistant, config_entry, hass_client_no_auth):
+    """Return an unauthenticated client, as Noonlight calls the webhook."""
+    return await hass_client_no_auth()
+
+
+@pytest.fixture
+async def alarm(hass: HomeAssistant, config_entry):
+    """Return an active alarm of the config entry."""
+    return await hass.data[DOMAIN][config_entry.entry_id].create_alarm(["police"])
+
+
+def _polls(noonlight_api, alarm) -> int:
+    return noonlight_api.requests.count(("GET", f"/alarms/{alarm.id}/status"))
+
+
+async def test_callback_is_confirmed_by_a_poll(
+    hass: HomeAssistant, config_entry, webhook_client, alarm, noonlight_api
+) -> None:
+    """A callback finishes the alarm once the API reports the same status."""
+    noonlight = hass.data[DOMAIN][config_entry.entry_id]
+    noonlight_api.alarms[alarm.id]["status"] = STATUS_CANCELED
+
+    resp = await webhook_client.post(
+        WEBHOOK_URL, json={"data": {"alarm_id": alarm.id, "status": "CANCELED"}}
+    )
+    await hass.async_block_till_done()
+
+    assert resp.status == 200
+    assert _polls(noonlight_api, alarm) == 1
+    assert noonlight.alarms.get(alarm.id) is None
+    assert noonlight.poll_settings.push_confirmed
+
+
+async def test_spoofed_callback_is_not_applied(
+    hass: HomeAssistant, config_entry, webhook_client, alarm, noonlight_api
+) -> None:
+    """A callback the API contradicts leaves the alarm active."""
+    noonlight = hass.data[DOMAIN][config_entry.entry_id]
+
+    resp = await webhook_client.post(
+        WEBHOOK_URL, json={"alarm_id": alarm.id, "status": "CANCELED"}
+    )
+    await hass.async_block_till_done()
+
+    assert resp.status == 200
+    assert _polls(noonlight_api, alarm) == 1
+    assert noonlight.alarms.get(alarm.id).status == "ACTIVE"
+    assert not noonlight.poll_settings.push_confirmed
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "not json",
+        "[]",
+        '{"data": []}',
+        '{"data": {"alarm_id": 1, "status": "CANCELED"}}',
+        '{"data": {"alarm_id": "alarm-1"}}',
+        '{"alarm_id": "alarm-404", "status": "CANCELED"}',
+    ],
+)
+async def test_malformed_callback_is_ignored(
+    hass: HomeAssistant,
+    config_entry,
+    webhook_client,
+    alarm,
+    noonlight_api,
+    payload,
+) -> None:
+    """A payload without a known alarm and a status does nothing."""
+    noonlight = hass.data[DOMAIN][config_entry.entry_id]
+
+    resp = await webhook_client.post(
+        WEBHOOK_URL, data=payload, headers={"Content-Type": "application/json"}
+    )
+    await hass.async_block_till_done()
+
+    assert resp.status == 200
+    assert _polls(noonlight_api, alarm) == 0
+    assert noonlight.alarms.get(alarm.id).status == "ACTIVE"